@@ -12,10 +12,24 @@ import os
 import random
 import re
 import time
+import bisect
+import difflib
 import hashlib
 import html
+import math
+import mmap
+import multiprocessing
+import queue
+import struct
 import sys
+import threading
+import tracemalloc
+import zlib
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from urllib.parse import urlparse
 
 # ---------- I/O & Env ----------
 try:
@@ -24,10 +38,8 @@ try:
 except Exception:
     pass  # Py<3.7 fallback
 
+# Validated when the env target is built (Target.from_env); --config runs name their own sites/collections
 REQUIRED_ENV_VARS = ['WEBFLOW_API_TOKEN', 'WEBFLOW_SITE_ID', 'WEBFLOW_COLLECTION_ID']
-_missing = [v for v in REQUIRED_ENV_VARS if not os.getenv(v)]
-if _missing:
-    raise ValueError(f"🔐 CRITICAL: Missing required environment variables: {', '.join(_missing)}")
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')
@@ -37,6 +49,12 @@ WEBFLOW_COLLECTION_ID = os.getenv('WEBFLOW_COLLECTION_ID')
 
 COLLECTION_PATH = os.getenv("WEBFLOW_COLLECTION_PATH", "fantasy-football-updates")
 
+# Hub pages linked from every article: /fantasy-football/{position}/ and /teams/{team}/fantasy/
+# Each hub type lives in its own collection; leave unset to skip that hub type.
+WEBFLOW_POSITION_HUB_COLLECTION_ID = os.getenv("WEBFLOW_POSITION_HUB_COLLECTION_ID")
+WEBFLOW_TEAM_HUB_COLLECTION_ID = os.getenv("WEBFLOW_TEAM_HUB_COLLECTION_ID")
+WEBFLOW_BULK_LIMIT = 100  # max items per Webflow list/bulk call
+
 # Optional exclusions
 EXCLUDE_TOP_N = int(os.getenv("EXCLUDE_TOP_N", "0"))      # e.g., 9 to skip ranks 1..9
 EXCLUDE_RANKS_ENV = os.getenv("EXCLUDE_RANKS", "")        # e.g., "1,2,3,11,13"
@@ -52,10 +70,59 @@ HAS_SUPABASE = bool(SUPABASE_URL and SUPABASE_ANON_KEY)
 STATE_DIR = os.getenv("STATE_DIR", ".")
 os.makedirs(STATE_DIR, exist_ok=True)
 
-POSTED_PATH = os.path.join(STATE_DIR, "posted_players.json")
-HASHES_PATH = os.path.join(STATE_DIR, "content_hashes.json")
-ANCHORS_PATH = os.path.join(STATE_DIR, "used_anchors.json")
-POSTED_RANKS_PATH = os.path.join(STATE_DIR, "posted_ranks.json")
+# Per-target state files (posted_players.json, content_hashes.json, ...) live in Target.state_dir;
+# Webflow metadata is keyed by collection/site id, so every target shares one state_data row (and file)
+WEBFLOW_META_PATH = os.path.join(STATE_DIR, "webflow_meta.json")
+
+# GET caching: collection schema + custom domain ids persist on disk; slug lookups are run-scoped
+WEBFLOW_META_TTL_SECONDS = float(os.getenv("WEBFLOW_META_TTL_SECONDS", "86400"))
+SLUG_LOOKUP_TTL_SECONDS = float(os.getenv("SLUG_LOOKUP_TTL_SECONDS", "300"))
+
+# Render cache: bump RENDER_TEMPLATE_VERSION whenever article markup changes. The HTML stays in a local
+# file; only each fingerprint's render time and content hash persist in state_data, which is enough to
+# re-render byte-identical HTML on a fresh runner
+RENDER_TEMPLATE_VERSION = "v6.2"
+RENDER_CACHE_MAX = int(os.getenv("RENDER_CACHE_MAX", "2000"))
+# Full re-renders (--render-offline, --reconcile --apply) fan cache misses out to processes; 0 workers = one per core
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "0"))
+RENDER_CHUNK_SIZE = int(os.getenv("RENDER_CHUNK_SIZE", "64"))
+RENDER_POOL_MIN = int(os.getenv("RENDER_POOL_MIN", "128"))  # below this, pool start-up costs more than it saves
+# Above RENDER_POOL_MIN the first chunk renders serially and is timed; the rest goes to the pool only when
+# the projected saving beats a forkserver start (fresh interpreter + this module's imports, ~0.5s)
+RENDER_POOL_STARTUP_SECONDS = float(os.getenv("RENDER_POOL_STARTUP_SECONDS", "0.5"))
+# Players per catalog (ordered by overall rank); daily runs, hubs and reconcile all read this window
+CATALOG_LIMIT = int(os.getenv("CATALOG_LIMIT", "175"))
+# Every POSTed article is archived (compressed segments + mmap'd slug/rank index) under <state dir>/archive
+ARCHIVE_SEGMENT_BYTES = int(os.getenv("ARCHIVE_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+
+# Headshot pipeline: concurrent HEAD checks + one-time upload to Webflow assets
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "8"))
+DEFAULT_IMAGE_URL = "https://cdn.prod.website-files.com/670bfa1fd9c3c20a149fa6a7/688d2acad067d5e2eb678698_footballblog.png"
+
+# Post-publish side effects (sitemap pings, URL warm-up) run off the critical path
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "4"))
+BACKGROUND_DRAIN_SECONDS = float(os.getenv("BACKGROUND_DRAIN_SECONDS", "20"))
+WARMUP_DELAY_SECONDS = float(os.getenv("WARMUP_DELAY_SECONDS", "5"))
+# Per-host circuit breaker: after N straight failures, fail fast for a cooldown, then probe once
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "60"))
+WEBFLOW_API_BASE = "https://api.webflow.com/v2"
+# Webflow requests per minute per site (0 = unlimited, rely on 429 backoff); --config targets default to 60
+WEBFLOW_RATE_PER_MINUTE = float(os.getenv("WEBFLOW_RATE_PER_MINUTE", "0"))
+# One keep-alive pool shared by every generator in the process
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+HTTP = requests.Session()
+HTTP.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_SIZE))
+
+# Publishing: queued item changes go live item-by-item, at most once per interval (the queue persists
+# across runs); archives or very large queues fall back to one full site publish
+PUBLISH_MIN_INTERVAL_SECONDS = float(os.getenv("PUBLISH_MIN_INTERVAL_SECONDS", "900"))
+PUBLISH_ITEM_MAX = int(os.getenv("PUBLISH_ITEM_MAX", "300"))
+
+SITEMAP_PINGS = [
+    "https://www.google.com/ping?sitemap=https://thebettinginsider.com/sitemap.xml",
+    "https://www.bing.com/ping?sitemap=https://thebettinginsider.com/sitemap.xml",
+]
 
 # ---------- Static Data (abridged to what we use) ----------
 ESPN_RANKINGS = {
@@ -112,6 +179,15 @@ INTRO_STYLES = {
     "comparison": "ESPN ranks {name} at #{espn_rank}, but Vegas betting markets tell a different story. Our market-implied projections place {name} at #{rank} overall.",
     "insight": "When sportsbooks set player prop lines, they're pricing real performance expectations. That market efficiency creates actionable fantasy insights traditional analysis overlooks."
 }
+RELATED_ANCHOR_TEMPLATES = [
+    "{name} fantasy outlook",
+    "{name} market-based ranking",
+    "{name} 2025 Vegas projection",
+    "where the market ranks {name}",
+]
+RELATED_LINKS_PER_ARTICLE = 3  # 2 nearest-rank at the same position + 1 teammate
+RELATED_CANDIDATES = 4         # nearest published neighbours considered per side
+
 FAQ_POOLS = {
     'primary': [
         "Is {name} worth a first-round pick in 2025?",
@@ -133,9 +209,807 @@ FAQ_POOLS = {
     ]
 }
 
+# ---------- Player records ----------
+PLAYER_TEXT_FIELDS = ('id', 'name', 'position', 'team', 'playoff_tier', 'player_headshot_url')
+PLAYER_NUMERIC_FIELDS = (
+    'overall_rank', 'position_rank',
+    'rushing_yards_line', 'receiving_yards_line', 'rushing_touchdowns_line', 'receiving_touchdowns_line',
+    'fantasy_score', 'playoff_sos_score', 'projected_games_missed',
+)
+COMPLETENESS_FIELDS = ('rushing_yards_line', 'receiving_yards_line', 'rushing_touchdowns_line',
+                       'receiving_touchdowns_line', 'fantasy_score')
+MIN_COMPLETE_FIELDS = 3  # fewer present market fields than this -> skip the player
+
+
+def _parse_number(value):
+    """Supabase numerics arrive as numbers, '1,234' strings, 'N/A' or None -> finite float or None."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = str(value).replace(',', '').strip()
+        if not text or text == 'N/A':
+            return None
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+    return number if math.isfinite(number) else None  # 'inf'/'nan' would break int() on ranks
+
+
+class PlayerRecord:
+    """
+    One player (players row merged with its betting breakdown), parsed and
+    validated once at ingest. Numeric fields are float or None; ranks are int.
+    """
+    __slots__ = PLAYER_TEXT_FIELDS + PLAYER_NUMERIC_FIELDS
+
+    @classmethod
+    def from_row(cls, row):
+        rec = cls()
+        for f in PLAYER_TEXT_FIELDS:
+            value = row.get(f)
+            if isinstance(value, str):
+                value = value.strip() or None
+            setattr(rec, f, value)
+        for f in PLAYER_NUMERIC_FIELDS:
+            setattr(rec, f, _parse_number(row.get(f)))
+        for f in ('overall_rank', 'position_rank'):
+            value = getattr(rec, f)
+            setattr(rec, f, int(value) if value is not None else None)
+        return rec
+
+    @property
+    def rank(self):
+        """Overall rank for sorting/dedupe; 999 when unknown (matches the old _safe_rank)."""
+        return self.overall_rank if self.overall_rank is not None else 999
+
+    def as_dict(self):
+        return {f: getattr(self, f) for f in self.__slots__}
+
+    def as_tuple(self):
+        """Compact form for shipping to render workers (field order = __slots__)."""
+        return tuple(getattr(self, f) for f in self.__slots__)
+
+    @classmethod
+    def from_tuple(cls, values):
+        rec = cls()
+        for f, value in zip(cls.__slots__, values):
+            setattr(rec, f, value)
+        return rec
+
+    def __repr__(self):
+        return f"PlayerRecord(#{self.overall_rank} {self.name} {self.position})"
+
+
+class PlayerCatalog:
+    """
+    The bulk-loaded player list: PlayerRecords for per-article work plus one
+    float array per numeric field (NaN = missing) for catalog-wide scans.
+    """
+    def __init__(self, records, has_market_data=False):
+        self.records = list(records)
+        self.has_market_data = has_market_data  # betting breakdown merged in at load time
+        self.columns = {
+            f: array('d', (math.nan if getattr(r, f) is None else getattr(r, f) for r in self.records))
+            for f in PLAYER_NUMERIC_FIELDS
+        }
+
+    @classmethod
+    def from_rows(cls, rows, has_market_data=False):
+        records = [PlayerRecord.from_row(r) for r in rows]
+        valid = [r for r in records if r.name]
+        if len(valid) != len(records):
+            print(f"⚠️ Dropped {len(records) - len(valid)} player rows without a name")
+        return cls(valid, has_market_data=has_market_data)
+
+    def completeness_scores(self, fields=COMPLETENESS_FIELDS):
+        """Present-field count per record, computed column by column (NaN != NaN marks missing)."""
+        scores = [0] * len(self.records)
+        for f in fields:
+            scores = [s + (v == v) for s, v in zip(scores, self.columns[f])]
+        return scores
+
+    def complete_records(self, min_present=MIN_COMPLETE_FIELDS):
+        return [r for r, score in zip(self.records, self.completeness_scores()) if score >= min_present]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+# ---------- Internal link index ----------
+class LinkIndex:
+    """
+    Published articles indexed by position and by team, each list kept sorted
+    by rank so the nearest neighbours of a rank are a bisect away.
+    """
+    def __init__(self):
+        self._by_position = {}  # position -> ([ranks], [(slug, name, rank, position)])
+        self._by_team = {}
+        self._slugs = set()
+
+    def __len__(self):
+        return len(self._slugs)
+
+    def add(self, position, team, rank, slug, name):
+        if slug in self._slugs:
+            return
+        self._slugs.add(slug)
+        entry = (slug, name, rank, position)
+        for key, table in ((position, self._by_position), (team, self._by_team)):
+            if not key:
+                continue
+            ranks, entries = table.setdefault(key, ([], []))
+            i = bisect.bisect_right(ranks, rank)
+            ranks.insert(i, rank)
+            entries.insert(i, entry)
+
+    def _nearest(self, table, key, rank, k, exclude):
+        ranks, entries = table.get(key, ([], []))
+        hi = bisect.bisect_left(ranks, rank)
+        lo = hi - 1
+        found = []
+        while len(found) < k and (lo >= 0 or hi < len(ranks)):
+            # walk outwards from the insertion point, closest rank first
+            if hi >= len(ranks) or (lo >= 0 and rank - ranks[lo] <= ranks[hi] - rank):
+                entry, lo = entries[lo], lo - 1
+            else:
+                entry, hi = entries[hi], hi + 1
+            if entry[0] not in exclude:
+                found.append(entry)
+        return found
+
+    def nearest_by_position(self, position, rank, k, exclude=()):
+        return self._nearest(self._by_position, position, rank, k, exclude)
+
+    def nearest_by_team(self, team, rank, k, exclude=()):
+        return self._nearest(self._by_team, team, rank, k, exclude)
+
+
+# ---------- Circuit breakers ----------
+class CircuitOpenError(RuntimeError):
+    """Raised instead of making a request while a host's circuit is open."""
+    def __init__(self, host):
+        super().__init__(f"circuit open for {host}")
+        self.host = host
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `threshold` consecutive failures (exceptions or 5xx).
+    While open every call fails fast; after `cooldown` seconds a single
+    half-open probe is let through and its outcome closes or re-opens it.
+    """
+    def __init__(self, host, threshold=3, cooldown=60.0):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "open" if time.monotonic() - self._opened_at < self.cooldown else "half-open"
+
+    def is_open(self):
+        return self.state == "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._probing:
+                return False
+            self._probing = True  # half-open: this caller is the probe
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"🔌 Circuit closed for {self.host}")
+            self._failures, self._opened_at, self._probing = 0, None, False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                print(f"🔌 Circuit OPEN for {self.host} after {self._failures} failures; failing fast for {self.cooldown:.0f}s")
+                self._opened_at, self._probing = time.monotonic(), False
+
+
+_CIRCUITS = {}
+_CIRCUITS_LOCK = threading.Lock()
+
+
+def circuit_breaker_for(url):
+    host = urlparse(url).netloc
+    with _CIRCUITS_LOCK:
+        if host not in _CIRCUITS:
+            _CIRCUITS[host] = CircuitBreaker(host, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN_SECONDS)
+        return _CIRCUITS[host]
+
+
+# ---------- Rate limits ----------
+class RateLimiter:
+    """
+    Token bucket shared by every target on one Webflow site. acquire() blocks
+    until a token is free; wait_time() lets the scheduler skip a site whose
+    budget is spent instead of blocking on it.
+    """
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(rate_per_minute)))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def wait_time(self):
+        with self._lock:
+            self._refill()
+            return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def rate_limiter_for(site_id, rate_per_minute):
+    """Per-site limiter (first caller's rate wins), or None when unlimited."""
+    if not rate_per_minute:
+        return None
+    with _RATE_LIMITERS_LOCK:
+        if site_id not in _RATE_LIMITERS:
+            _RATE_LIMITERS[site_id] = RateLimiter(rate_per_minute)
+        return _RATE_LIMITERS[site_id]
+
+
+# ---------- Publish coordination ----------
+class PublishCoordinator:
+    """
+    Unpublished Webflow changes for one site, persisted across runs. Created
+    or updated items queue up per collection; plan() says whether to publish
+    now, and whether item-level publishing covers it or the site needs a full
+    publish (archived items, or more items than PUBLISH_ITEM_MAX).
+    """
+    def __init__(self, state=None, min_interval=PUBLISH_MIN_INTERVAL_SECONDS, item_max=PUBLISH_ITEM_MAX):
+        state = state if isinstance(state, dict) else {}
+        self.pending = {cid: list(ids) for cid, ids in (state.get('pending') or {}).items()}
+        self.urls = list(state.get('urls') or [])
+        self.site_dirty = bool(state.get('site_dirty'))
+        self.last_publish = float(state.get('last_publish') or 0)
+        self.min_interval = min_interval
+        self.item_max = item_max
+
+    def as_state(self):
+        return {'pending': self.pending, 'urls': self.urls, 'site_dirty': self.site_dirty,
+                'last_publish': self.last_publish}
+
+    @property
+    def item_count(self):
+        return sum(len(ids) for ids in self.pending.values())
+
+    def add_items(self, collection_id, item_ids, urls=()):
+        queued = self.pending.setdefault(collection_id, [])
+        queued.extend(i for i in item_ids if i and i not in queued)
+        self.urls.extend(u for u in urls if u not in self.urls)
+
+    def mark_site_dirty(self):
+        self.site_dirty = True
+
+    def plan(self, force=False, now=None):
+        """'idle' (nothing changed), 'defer' (published too recently), 'items' or 'site'."""
+        if not self.item_count and not self.site_dirty:
+            return 'idle'
+        now = time.time() if now is None else now
+        if not force and now - self.last_publish < self.min_interval:
+            return 'defer'
+        if self.site_dirty or self.item_count > self.item_max:
+            return 'site'
+        return 'items'
+
+    def published(self, now=None):
+        self.pending, self.urls, self.site_dirty = {}, [], False
+        self.last_publish = time.time() if now is None else now
+
+
+_PUBLISHERS = {}
+_PUBLISHERS_LOCK = threading.Lock()
+
+
+def publish_coordinator_for(site_id, load_state):
+    """One coordinator per site in the process; load_state() only runs for the first caller."""
+    with _PUBLISHERS_LOCK:
+        if site_id not in _PUBLISHERS:
+            _PUBLISHERS[site_id] = PublishCoordinator(load_state())
+        return _PUBLISHERS[site_id]
+
+
+_IMAGE_ASSETS = {}
+_IMAGE_ASSETS_LOCK = threading.Lock()
+
+
+def image_assets_for(site_id, load_state):
+    """One headshot url -> Webflow asset map per site (assets belong to the site, not a collection)."""
+    with _IMAGE_ASSETS_LOCK:
+        if site_id not in _IMAGE_ASSETS:
+            _IMAGE_ASSETS[site_id] = load_state()
+        return _IMAGE_ASSETS[site_id]
+
+
+# ---------- Targets ----------
+class Target:
+    """
+    One Webflow collection to post into. The env target ("default") keeps the
+    original state files and Supabase keys; every other target gets its own
+    STATE_DIR/<name>/ directory and "<key>:<name>" state_data rows.
+    """
+    DEFAULT = "default"
+
+    def __init__(self, name, site_id, collection_id, collection_path=COLLECTION_PATH, api_token=None,
+                 positions=None, posts=None, rate_per_minute=WEBFLOW_RATE_PER_MINUTE):
+        self.name = name
+        self.site_id = site_id
+        self.collection_id = collection_id
+        self.collection_path = collection_path
+        self.api_token = api_token or WEBFLOW_API_TOKEN
+        self.positions = set(positions) if positions else None
+        self.posts = posts
+        self.rate_per_minute = rate_per_minute
+
+    @classmethod
+    def from_env(cls):
+        missing = [v for v in REQUIRED_ENV_VARS if not os.getenv(v)]
+        if missing:
+            raise ValueError(f"🔐 CRITICAL: Missing required environment variables: {', '.join(missing)}")
+        return cls(cls.DEFAULT, WEBFLOW_SITE_ID, WEBFLOW_COLLECTION_ID)
+
+    @classmethod
+    def from_config(cls, cfg, defaults=None):
+        cfg = {**(defaults or {}), **cfg}
+        token_env = cfg.get('api_token_env', 'WEBFLOW_API_TOKEN')
+        target = cls(
+            cfg['name'], cfg.get('site_id') or WEBFLOW_SITE_ID, cfg['collection_id'],
+            collection_path=cfg.get('collection_path', COLLECTION_PATH),
+            api_token=os.getenv(token_env), positions=cfg.get('positions'), posts=cfg.get('posts'),
+            rate_per_minute=float(cfg.get('rate_per_minute', WEBFLOW_RATE_PER_MINUTE or 60)),
+        )
+        missing = [k for k, v in (('site_id', target.site_id), (token_env, target.api_token)) if not v]
+        if missing:
+            raise ValueError(f"🔐 Target {target.name}: missing {', '.join(missing)}")
+        return target
+
+    @property
+    def is_default(self):
+        return self.name == self.DEFAULT
+
+    @property
+    def state_dir(self):
+        return STATE_DIR if self.is_default else os.path.join(STATE_DIR, self.name)
+
+    def path(self, filename):
+        return os.path.join(self.state_dir, filename)
+
+    def state_key(self, key):
+        return key if self.is_default else f"{key}:{self.name}"
+
+    def __repr__(self):
+        return f"Target({self.name!r}, site={self.site_id}, collection={self.collection_id})"
+
+
+def load_targets(path):
+    """
+    Targets from a JSON config:
+      {"defaults": {"site_id": ..., "rate_per_minute": 60},
+       "targets": [{"name": "qb", "collection_id": ..., "collection_path": ..., "positions": ["QB"], "posts": 3}]}
+    """
+    with open(path) as f:
+        cfg = json.load(f)
+    targets = [Target.from_config(t, cfg.get('defaults')) for t in cfg.get('targets', [])]
+    names = [t.name for t in targets]
+    if not targets or len(set(names)) != len(names):
+        raise ValueError(f"❌ {path}: need at least one target and unique target names (got {names})")
+    return targets
+
+
+_WF_META_LOCK = threading.Lock()  # webflow_meta is shared by every target in the process
+
+
+# ---------- Background tasks ----------
+class BackgroundTasks:
+    """
+    Small daemon-thread queue for side effects nobody waits on. drain() gives
+    them a bounded amount of time at shutdown; anything still running is
+    abandoned (daemon threads never hold the process open).
+    """
+    def __init__(self, workers=4):
+        self._tasks = queue.Queue()
+        self._cv = threading.Condition()
+        self._outstanding = 0
+        self._failed = []
+        self._workers = max(1, workers)
+        self._started = False
+
+    def _start(self):
+        for i in range(self._workers):
+            threading.Thread(target=self._worker, name=f"bg-{i}", daemon=True).start()
+        self._started = True
+
+    def submit(self, label, fn, *args, **kwargs):
+        fut = Future()
+        with self._cv:
+            if not self._started:
+                self._start()
+            self._outstanding += 1
+        self._tasks.put((label, fn, args, kwargs, fut))
+        return fut
+
+    def _worker(self):
+        while True:
+            label, fn, args, kwargs, fut = self._tasks.get()
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                fut.set_exception(e)
+                self._failed.append(label)
+            finally:
+                with self._cv:
+                    self._outstanding -= 1
+                    self._cv.notify_all()
+
+    def drain(self, timeout):
+        with self._cv:
+            if not self._outstanding:
+                return True
+            print(f"⏳ Waiting up to {timeout:.0f}s for {self._outstanding} background task(s)...")
+            finished = self._cv.wait_for(lambda: self._outstanding == 0, timeout=timeout)
+            left = self._outstanding
+        if self._failed:
+            print(f"⚠️ Background tasks failed: {', '.join(self._failed)}")
+        if not finished:
+            print(f"⏳ Abandoning {left} background task(s) after {timeout:.0f}s")
+        return finished
+
+
+# ---------- Profiling ----------
+class StageProfiler:
+    """
+    Per-stage wall time and tracemalloc peak for --profile runs, plus a
+    main-thread stack sampler whose output is rooted at the active stage
+    (collapsed format: feed to flamegraph.pl or speedscope). Disabled
+    instances make stage() a no-op, so the hooks stay in the hot path.
+    """
+    def __init__(self, enabled=False, interval=0.005):
+        self.enabled = enabled
+        self.interval = interval
+        self.stats = {}      # stage -> [calls, seconds, peak_bytes]
+        self.samples = {}    # collapsed stack -> count
+        self._current = "other"
+        self._active = []    # open stages, innermost last: [name, peak carried up from nested stages]
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        if not self.enabled:
+            return
+        tracemalloc.start()
+        main_id = threading.main_thread().ident
+        self._sampler = threading.Thread(target=self._sample, args=(main_id,), name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        if self._sampler:
+            self._stop.set()
+            self._sampler.join()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _sample(self, thread_id):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = ";".join([self._current] + stack[::-1])
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        # Nested stages: reset_peak() would wipe the outer stage's peak, so the
+        # outer's peak so far is carried past the inner stage and merged back.
+        tracing = tracemalloc.is_tracing()
+        outer, self._current = self._current, name
+        reentered = any(entry[0] == name for entry in self._active)
+        carried = tracemalloc.get_traced_memory()[1] if tracing and self._active else 0
+        if tracing:
+            tracemalloc.reset_peak()
+        self._active.append([name, 0])
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            peak = max(tracemalloc.get_traced_memory()[1] if tracing else 0, self._active.pop()[1])
+            if self._active:
+                self._active[-1][1] = max(self._active[-1][1], carried, peak)
+            calls, seconds, prev_peak = self.stats.get(name, (0, 0.0, 0))
+            # a stage nested in itself is already timed by the outer one
+            self.stats[name] = (calls + (not reentered), seconds + (0 if reentered else elapsed), max(prev_peak, peak))
+            self._current = outer
+
+    def report(self, prefix, pstats_obj=None):
+        print("\n⏱️ Profile by stage:")
+        print(f"   {'stage':<12}{'calls':>7}{'seconds':>10}{'peak MB':>10}")
+        for name, (calls, seconds, peak) in sorted(self.stats.items(), key=lambda kv: -kv[1][1]):
+            print(f"   {name:<12}{calls:>7}{seconds:>10.2f}{peak / 1e6:>10.1f}")
+        with open(f"{prefix}.collapsed", "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+        print(f"🔥 Collapsed stacks: {prefix}.collapsed ({sum(self.samples.values())} samples)")
+        if pstats_obj is not None:
+            pstats_obj.dump_stats(f"{prefix}.pstats")
+            print(f"📈 cProfile stats: {prefix}.pstats")
+            pstats_obj.sort_stats("cumulative").print_stats(15)
+
+
+# ---------- Article archive ----------
+class ArticleArchive:
+    """
+    Append-only record of every article we POSTed. Each version is one
+    zlib-compressed JSON record (length-framed) in size-capped segment files.
+    index.bin is an mmap'd open-addressing hash table from "slug:<slug>" and
+    "rank:<n>" to the newest record; each record points at the previous
+    version of its slug, so lookups read and decompress one record. The
+    header records how far into the last segment the index reaches; an
+    index that disagrees with the segment files is rebuilt on open.
+    """
+    MAGIC = b'ARTIDX02'
+    _HEADER = struct.Struct('<8sQQIQ')  # magic, capacity, used slots, last segment, its indexed end offset
+    _SLOT = struct.Struct('<QIQII')    # key hash (0 = empty), segment, offset, length, versions
+    _FRAME = struct.Struct('<I')       # compressed length ahead of each record
+
+    def __init__(self, directory, segment_bytes=ARCHIVE_SEGMENT_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._index_path = os.path.join(directory, 'index.bin')
+        self._mm = None
+        self._capacity = self._used = 0
+        self._tail = (0, 0)
+
+    def _segment_path(self, n):
+        return os.path.join(self.directory, f'segment-{n:05d}.z')
+
+    def _segments(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(f[8:13]) for f in os.listdir(self.directory) if f.startswith('segment-'))
+
+    @staticmethod
+    def _key_hash(key):
+        # 64-bit keys; a collision between two live slugs/ranks is not a practical concern
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+    def _segment_tail(self):
+        """(last segment, its size) as it is on disk."""
+        segments = self._segments()
+        if not segments:
+            return (0, 0)
+        return (segments[-1], os.path.getsize(self._segment_path(segments[-1])))
+
+    # ----- Index (mmap'd hash table) -----
+    def _write_table(self, capacity, slots, tail=(0, 0)):
+        buf = bytearray(self._HEADER.size + capacity * self._SLOT.size)
+        self._HEADER.pack_into(buf, 0, self.MAGIC, capacity, len(slots), *tail)
+        for slot in slots:
+            i = slot[0] % capacity
+            while self._SLOT.unpack_from(buf, self._HEADER.size + i * self._SLOT.size)[0]:
+                i = (i + 1) % capacity
+            self._SLOT.pack_into(buf, self._HEADER.size + i * self._SLOT.size, *slot)
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(buf)
+        os.replace(tmp, self._index_path)
+
+    def _write_header(self):
+        self._HEADER.pack_into(self._mm, 0, self.MAGIC, self._capacity, self._used, *self._tail)
+
+    def _open_index(self, check=True):
+        if self._mm is None:
+            os.makedirs(self.directory, exist_ok=True)
+            if not os.path.exists(self._index_path):
+                if self._segments():
+                    self.rebuild_index()
+                    return self._mm
+                self._write_table(1024, [])
+            with open(self._index_path, 'r+b') as f:
+                self._mm = mmap.mmap(f.fileno(), 0)
+            magic, self._capacity, self._used, *tail = self._HEADER.unpack_from(self._mm, 0)
+            self._tail = tuple(tail)
+            if check and (magic != self.MAGIC or self._tail != self._segment_tail()):
+                # older format, or segments written past (or cut short of) what the index saw
+                print(f"⚠️ {self._index_path} is out of date with its segments; rebuilding")
+                self.rebuild_index()
+        return self._mm
+
+    def _find(self, key):
+        """(slot index, slot or None): where the key lives, or where it would go."""
+        mm = self._open_index()
+        h = self._key_hash(key)
+        i = h % self._capacity
+        while True:
+            slot = self._SLOT.unpack_from(mm, self._HEADER.size + i * self._SLOT.size)
+            if slot[0] in (0, h):
+                return i, (slot if slot[0] else None)
+            i = (i + 1) % self._capacity
+
+    def _put(self, key, location, versions):
+        i, slot = self._find(key)
+        if slot is None:
+            if (self._used + 1) * 2 > self._capacity:
+                self._grow()
+                i, slot = self._find(key)
+            self._used += 1
+            self._write_header()
+        self._SLOT.pack_into(self._mm, self._HEADER.size + i * self._SLOT.size,
+                             self._key_hash(key), *location, versions)
+
+    def _grow(self):
+        mm = self._mm
+        slots = [s for s in (self._SLOT.unpack_from(mm, self._HEADER.size + i * self._SLOT.size)
+                             for i in range(self._capacity)) if s[0]]
+        capacity, tail = self._capacity * 2, self._tail
+        self.close()
+        self._write_table(capacity, slots, tail)
+        self._open_index(check=False)
+
+    def rebuild_index(self):
+        """
+        Recreate index.bin by replaying every segment (e.g. after the index was
+        lost). A segment ending in a partial record (a crash mid-append) is
+        truncated after its last complete record.
+        """
+        self.close()
+        self._write_table(1024, [])
+        self._open_index(check=False)
+        for n in self._segments():
+            with open(self._segment_path(n), 'rb') as f:
+                data = f.read()
+            pos = 0
+            while pos < len(data):
+                try:
+                    (length,) = self._FRAME.unpack_from(data, pos)
+                    offset = pos + self._FRAME.size
+                    if offset + length > len(data):
+                        raise ValueError("record runs past the end of the segment")
+                    record = json.loads(zlib.decompress(data[offset:offset + length]))
+                except (struct.error, zlib.error, ValueError) as e:
+                    print(f"⚠️ {self._segment_path(n)}: dropping {len(data) - pos} bytes after the last complete record ({e})")
+                    with open(self._segment_path(n), 'r+b') as f:
+                        f.truncate(pos)
+                    break
+                self._index_record(record, (n, offset, length))
+                pos = offset + length
+        self._tail = self._segment_tail()
+        self._write_header()
+        self._mm.flush()
+
+    def _index_record(self, record, location):
+        for key in (f"slug:{record['slug']}", f"rank:{record['rank']}" if record.get('rank') is not None else None):
+            if key:
+                _, slot = self._find(key)
+                self._put(key, location, (slot[4] if slot else 0) + 1)
+
+    # ----- Records -----
+    def append(self, slug, rank, field_data, fingerprint, content_hash):
+        """Archive one version of an article; returns its version number for the slug."""
+        _, prev = self._find(f"slug:{slug}")
+        record = {
+            'slug': slug, 'rank': rank, 'fingerprint': fingerprint, 'content_hash': content_hash,
+            'archived_at': datetime.now(timezone.utc).isoformat(), 'fieldData': field_data,
+            'prev': list(prev[1:4]) if prev else None,
+        }
+        blob = zlib.compress(json.dumps(record, separators=(',', ':'), default=str).encode(), 6)
+        segment = (self._segments() or [0])[-1]
+        path = self._segment_path(segment)
+        if os.path.exists(path) and os.path.getsize(path) and os.path.getsize(path) + len(blob) > self.segment_bytes:
+            segment += 1
+            path = self._segment_path(segment)
+        with open(path, 'ab') as f:
+            offset = f.tell() + self._FRAME.size
+            f.write(self._FRAME.pack(len(blob)) + blob)
+        # data first, then the index, then the tail: a crash in between leaves a
+        # segment longer than the header says, and the next open rebuilds
+        self._index_record(record, (segment, offset, len(blob)))
+        self._tail = (segment, offset + len(blob))
+        self._write_header()
+        self._mm.flush()
+        return (prev[4] if prev else 0) + 1
+
+    def _read(self, segment, offset, length):
+        with open(self._segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            return json.loads(zlib.decompress(f.read(length)))
+
+    def get(self, slug=None, rank=None, version=0):
+        """Newest archived record for a slug (or rank), or `version` steps back from it; None if absent."""
+        _, slot = self._find(f"slug:{slug}" if slug is not None else f"rank:{rank}")
+        if slot is None:
+            return None
+        record = self._read(*slot[1:4])
+        for _ in range(version):
+            if not record.get('prev'):
+                return None
+            record = self._read(*record['prev'])
+        return record
+
+    def versions(self, slug):
+        _, slot = self._find(f"slug:{slug}")
+        return slot[4] if slot else 0
+
+    def diff(self, slug, older=1, newer=0, field='post-body'):
+        """Unified diff of one fieldData field between two archived versions of a slug."""
+        a, b = self.get(slug, version=older), self.get(slug, version=newer)
+        if not a or not b:
+            return None
+        return '\n'.join(difflib.unified_diff(
+            str(a['fieldData'].get(field, '')).splitlines(), str(b['fieldData'].get(field, '')).splitlines(),
+            fromfile=f"{slug}@{a['archived_at']}", tofile=f"{slug}@{b['archived_at']}", lineterm=''))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
 # ---------- Core ----------
 class ProductionBlogGenerator:
-    def __init__(self):
+    def __init__(self, target=None):
+        self.target = target or Target.from_env()
+        self.site_id = self.target.site_id
+        self.collection_id = self.target.collection_id
+        self.collection_path = self.target.collection_path
+        self.state_dir = self.target.state_dir
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.posted_path = self.target.path("posted_players.json")
+        self.hashes_path = self.target.path("content_hashes.json")
+        self.anchors_path = self.target.path("used_anchors.json")
+        self.posted_ranks_path = self.target.path("posted_ranks.json")
+        self._image_assets_key = f"image_assets:{self.site_id}"
+        self.image_assets_path = os.path.join(STATE_DIR, f"image_assets_{self.site_id}.json")
+        self.render_cache_path = self.target.path("render_cache.json")
+        self.render_stamps_path = self.target.path("render_stamps.json")
+        self.reconcile_report_path = self.target.path("reconcile_report.json")
+        self.rate_limiter = rate_limiter_for(self.site_id, self.target.rate_per_minute)
+        self.archive = ArticleArchive(self.target.path("archive"))
+
         self.supabase_headers = {
             'apikey': SUPABASE_ANON_KEY,
             'Authorization': f'Bearer {SUPABASE_ANON_KEY}',
@@ -144,21 +1018,22 @@ class ProductionBlogGenerator:
         } if HAS_SUPABASE else {}
 
         self.webflow_headers = {
-            'Authorization': f'Bearer {WEBFLOW_API_TOKEN}',
+            'Authorization': f'Bearer {self.target.api_token}',
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         }
 
         # If state_data table is missing, silently fallback to files after first 404
         self._state_data_writes_disabled = False
-        self._posted_articles_writes_disabled = False  # quiet legacy name-log if table missing
+        # quiet legacy name-log if table missing; it is keyed by player name alone, so only the env target uses it
+        self._posted_articles_writes_disabled = not self.target.is_default
 
         if HAS_SUPABASE:
             self.init_supabase_state()
 
         if os.getenv("RESET_STATE") == "1":
             print("🔄 RESET_STATE=1 detected - clearing all local state files")
-            for path in [POSTED_PATH, HASHES_PATH, ANCHORS_PATH, POSTED_RANKS_PATH]:
+            for path in [self.posted_path, self.hashes_path, self.anchors_path, self.posted_ranks_path]:
                 if os.path.exists(path):
                     os.remove(path)
                     print(f"🗑️ Deleted {path}")
@@ -166,7 +1041,45 @@ class ProductionBlogGenerator:
         self.content_hashes = self.load_content_hashes_from_supabase()
         self.posted_players = self.load_posted_players_from_supabase()
         self.used_anchors = self.load_used_anchors_from_supabase()
+        if not isinstance(self.used_anchors, dict):
+            self.used_anchors = {}
+        for bucket in ('keywords', 'templates', 'targets'):  # usage counters for even anchor spread
+            self.used_anchors.setdefault(bucket, {})
+        self.link_index = LinkIndex()
+        self._live_slugs = {}  # collection id -> slugs live in Webflow (scanned once per run)
         self.posted_ranks = self.load_posted_ranks_from_supabase()
+        self.image_assets = image_assets_for(self.site_id, self._load_image_assets)
+
+        self._render_cache = None  # loaded on first render
+        self._render_stamps = None
+        self._render_cache_dirty = False
+        self._render_stamps_key = 'render_stamps'  # None: file only (offline renders)
+
+        # Run-scoped GET cache with in-flight coalescing, and the persisted Webflow metadata
+        self._get_cache = {}     # url -> (expires_monotonic, response)
+        self._get_inflight = {}  # url -> Future of the leader's response
+        self._get_lock = threading.Lock()
+        self._wf_meta = self._load_state_key('webflow_meta', WEBFLOW_META_PATH, {}, shared=True)
+        self._wf_meta.setdefault('collections', {})
+        self._wf_meta.setdefault('domains', {})
+        self._wf_meta_lock = _WF_META_LOCK
+
+        self.profiler = StageProfiler()  # replaced by an enabled one under --profile
+        self.background = BackgroundTasks(BACKGROUND_WORKERS)
+        self._domains_future = None
+        self.force_publish = False  # --force-publish: ignore PUBLISH_MIN_INTERVAL_SECONDS
+        self._publish_key = f"publish_state:{self.site_id}"
+        self.publish_state_path = os.path.join(STATE_DIR, f"publish_state_{self.site_id}.json")
+        self.publisher = publish_coordinator_for(
+            self.site_id, lambda: self._load_state_key(self._publish_key, self.publish_state_path, {}, shared=True))
+
+    @classmethod
+    def renderer(cls, collection_path, image_assets):
+        """Render-only instance for worker processes: no state loads, no network."""
+        self = cls.__new__(cls)
+        self.collection_path = collection_path
+        self.image_assets = image_assets
+        return self
 
     # ----- Canonicalization -----
     def _canon(self, s: str) -> str:
@@ -180,6 +1093,9 @@ class ProductionBlogGenerator:
     def _slugify_name(self, full_name: str) -> str:
         return full_name.lower().replace(' ', '-').replace('.', '').replace("'", "")
 
+    def _team_slug(self, team: str) -> str:
+        return team.lower().replace(' ', '-')
+
     # ----- Supabase / State init -----
     def init_supabase_state(self):
         try:
@@ -189,25 +1105,27 @@ class ProductionBlogGenerator:
 
     # ----- Content hashes -----
     def load_content_hashes_from_supabase(self):
+        if not HAS_SUPABASE:
+            return self._load_set(self.hashes_path)
         try:
-            r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.content_hashes', self.supabase_headers)
+            r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.{self.target.state_key("content_hashes")}', self.supabase_headers)
             if r.status_code == 200:
                 data = r.json()
                 if data:
                     return set(data[0]['data'])
         except Exception:
             pass
-        return self._load_set(HASHES_PATH)
+        return self._load_set(self.hashes_path)
 
     def save_content_hashes_to_supabase(self):
         if self._state_data_writes_disabled or not HAS_SUPABASE:
-            self._save_set(HASHES_PATH, self.content_hashes)
+            self._save_set(self.hashes_path, self.content_hashes)
             return
         try:
-            payload = {'key': 'content_hashes', 'data': list(self.content_hashes),
+            payload = {'key': self.target.state_key('content_hashes'), 'data': list(self.content_hashes),
                        'updated_at': datetime.now(timezone.utc).isoformat()}
-            r = requests.post(
-                f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
+            r = self._request(
+                'post', f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
                 headers={**self.supabase_headers, 'Prefer': 'resolution=merge-duplicates'},
                 json=payload, timeout=30
             )
@@ -215,23 +1133,25 @@ class ProductionBlogGenerator:
                 if r.status_code == 404:
                     self._state_data_writes_disabled = True
                     print("ℹ️ state_data not found; using local files for state (no more warnings).")
-                self._save_set(HASHES_PATH, self.content_hashes)
+                self._save_set(self.hashes_path, self.content_hashes)
         except Exception:
-            self._save_set(HASHES_PATH, self.content_hashes)
+            self._save_set(self.hashes_path, self.content_hashes)
 
     # ----- Posted players (legacy, by name) -----
     def load_posted_players_from_supabase(self):
+        if not HAS_SUPABASE or not self.target.is_default:
+            return self._load_list(self.posted_path)
         try:
             r = self._get(f'{SUPABASE_URL}/rest/v1/posted_articles?select=player_name', self.supabase_headers)
             if r.status_code == 200:
                 return [self._canon(d['player_name']) for d in r.json()]
         except Exception:
             pass
-        return self._load_list(POSTED_PATH)
+        return self._load_list(self.posted_path)
 
     def save_posted_player_to_supabase(self, player_name, slug, content_hash):
         if self._posted_articles_writes_disabled or not HAS_SUPABASE:
-            self._append_list(POSTED_PATH, self._canon(player_name))
+            self._append_list(self.posted_path, self._canon(player_name))
             return False
         try:
             c = self._canon(player_name)
@@ -239,8 +1159,8 @@ class ProductionBlogGenerator:
                 'player_name': c, 'slug': slug, 'content_hash': content_hash,
                 'created_at': datetime.now(timezone.utc).isoformat()
             }
-            r = requests.post(
-                f'{SUPABASE_URL}/rest/v1/posted_articles?on_conflict=player_name',
+            r = self._request(
+                'post', f'{SUPABASE_URL}/rest/v1/posted_articles?on_conflict=player_name',
                 headers={**self.supabase_headers, 'Prefer': 'resolution=merge-duplicates'},
                 json=payload, timeout=30
             )
@@ -248,33 +1168,35 @@ class ProductionBlogGenerator:
                 return True
             if r.status_code == 404:
                 self._posted_articles_writes_disabled = True
-            self._append_list(POSTED_PATH, c)
+            self._append_list(self.posted_path, c)
             return False
         except Exception:
-            self._append_list(POSTED_PATH, self._canon(player_name))
+            self._append_list(self.posted_path, self._canon(player_name))
             return False
 
     # ----- Used anchors -----
     def load_used_anchors_from_supabase(self):
+        if not HAS_SUPABASE:
+            return self._load_json(self.anchors_path, {})
         try:
-            r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.used_anchors', self.supabase_headers)
+            r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.{self.target.state_key("used_anchors")}', self.supabase_headers)
             if r.status_code == 200:
                 data = r.json()
                 if data:
                     return data[0]['data']
         except Exception:
             pass
-        return self._load_json(ANCHORS_PATH, {})
+        return self._load_json(self.anchors_path, {})
 
     def save_used_anchors_to_supabase(self):
         if self._state_data_writes_disabled or not HAS_SUPABASE:
-            self._save_json(ANCHORS_PATH, self.used_anchors)
+            self._save_json(self.anchors_path, self.used_anchors)
             return
         try:
-            payload = {'key': 'used_anchors', 'data': self.used_anchors,
+            payload = {'key': self.target.state_key('used_anchors'), 'data': self.used_anchors,
                        'updated_at': datetime.now(timezone.utc).isoformat()}
-            r = requests.post(
-                f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
+            r = self._request(
+                'post', f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
                 headers={**self.supabase_headers, 'Prefer': 'resolution=merge-duplicates'},
                 json=payload, timeout=30
             )
@@ -282,30 +1204,30 @@ class ProductionBlogGenerator:
                 if r.status_code == 404:
                     self._state_data_writes_disabled = True
                     print("ℹ️ state_data not found; using local files for state (no more warnings).")
-                self._save_json(ANCHORS_PATH, self.used_anchors)
+                self._save_json(self.anchors_path, self.used_anchors)
         except Exception:
-            self._save_json(ANCHORS_PATH, self.used_anchors)
+            self._save_json(self.anchors_path, self.used_anchors)
 
     # ----- posted_ranks (true dedupe) -----
     def load_posted_ranks_from_supabase(self):
         try:
             if HAS_SUPABASE:
-                r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.posted_ranks', self.supabase_headers)
+                r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.{self.target.state_key("posted_ranks")}', self.supabase_headers)
                 if r.status_code == 200 and r.json():
                     return set(r.json()[0]['data'])
         except Exception:
             pass
-        return self._load_set(POSTED_RANKS_PATH)
+        return self._load_set(self.posted_ranks_path)
 
     def save_posted_ranks_to_supabase(self):
         if self._state_data_writes_disabled or not HAS_SUPABASE:
-            self._save_set(POSTED_RANKS_PATH, self.posted_ranks)
+            self._save_set(self.posted_ranks_path, self.posted_ranks)
             return
         try:
-            payload = {'key': 'posted_ranks', 'data': sorted(list(self.posted_ranks)),
+            payload = {'key': self.target.state_key('posted_ranks'), 'data': sorted(list(self.posted_ranks)),
                        'updated_at': datetime.now(timezone.utc).isoformat()}
-            r = requests.post(
-                f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
+            r = self._request(
+                'post', f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
                 headers={**self.supabase_headers, 'Prefer': 'resolution=merge-duplicates'},
                 json=payload, timeout=30
             )
@@ -313,57 +1235,245 @@ class ProductionBlogGenerator:
                 if r.status_code == 404:
                     self._state_data_writes_disabled = True
                     print("ℹ️ state_data not found; using local files for state (no more warnings).")
-                self._save_set(POSTED_RANKS_PATH, self.posted_ranks)
+                self._save_set(self.posted_ranks_path, self.posted_ranks)
         except Exception:
-            self._save_set(POSTED_RANKS_PATH, self.posted_ranks)
+            self._save_set(self.posted_ranks_path, self.posted_ranks)
+
+    # ----- Generic state_data keys (Supabase + file fallback) -----
+    def _load_state_key(self, key, path, default, shared=False):
+        """shared=True keys (site-level state) are not scoped to the target."""
+        row = key if shared else self.target.state_key(key)
+        try:
+            if HAS_SUPABASE:
+                r = self._get(f'{SUPABASE_URL}/rest/v1/state_data?key=eq.{row}', self.supabase_headers)
+                if r.status_code == 200 and r.json():
+                    return r.json()[0]['data']
+        except Exception:
+            pass
+        return self._load_json(path, default)
+
+    def _save_state_key(self, key, path, obj, shared=False):
+        if self._state_data_writes_disabled or not HAS_SUPABASE:
+            self._save_json(path, obj)
+            return
+        try:
+            payload = {'key': key if shared else self.target.state_key(key), 'data': obj, 'updated_at': datetime.now(timezone.utc).isoformat()}
+            r = self._request(
+                'post', f'{SUPABASE_URL}/rest/v1/state_data?on_conflict=key',
+                headers={**self.supabase_headers, 'Prefer': 'resolution=merge-duplicates'},
+                json=payload, timeout=30
+            )
+            if r.status_code not in (200, 201):
+                if r.status_code == 404:
+                    self._state_data_writes_disabled = True
+                    print("ℹ️ state_data not found; using local files for state (no more warnings).")
+                self._save_json(path, obj)
+        except Exception:
+            self._save_json(path, obj)
 
     # ----- HTTP helpers -----
-    def _get(self, url, headers, tries=3):
+    def _request(self, method, url, **kwargs):
+        """
+        Every outbound call goes through here so the host's circuit breaker sees
+        it; Webflow API calls also take a token from the site's rate limiter.
+        """
+        if not urlparse(url).netloc:
+            raise ValueError(f"Refusing request without a host: {url}")
+        breaker = circuit_breaker_for(url)
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.host)
+        if self.rate_limiter and url.startswith(WEBFLOW_API_BASE):
+            self.rate_limiter.acquire()
+        try:
+            r = getattr(HTTP, method)(url, **kwargs)
+        except Exception:
+            breaker.record_failure()
+            raise
+        if r.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return r
+
+    def _backoff(self, url, attempt):
+        """Retry sleep, skipped (fail fast) once the host's circuit has opened."""
+        breaker = circuit_breaker_for(url)
+        if breaker.is_open():
+            raise CircuitOpenError(breaker.host)
+        time.sleep((2**attempt) * 2 + random.uniform(0, 1.5))
+
+    def _upstream_down(self):
+        """Hosts (Webflow API / Supabase) whose circuit is currently open."""
+        urls = [WEBFLOW_API_BASE] + ([SUPABASE_URL] if HAS_SUPABASE else [])
+        return [b.host for b in map(circuit_breaker_for, urls) if b.is_open()]
+
+    def _get(self, url, headers, tries=3, ttl=None):
+        """
+        GET with backoff. With a ttl, 200 responses are cached for that many
+        seconds and concurrent callers for the same URL share one request.
+        """
+        if not ttl:
+            return self._get_with_backoff(url, headers, tries)
+        with self._get_lock:
+            hit = self._get_cache.get(url)
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+            fut = self._get_inflight.get(url)
+            leader = fut is None
+            if leader:
+                fut = self._get_inflight[url] = Future()
+        if not leader:
+            return fut.result()
+        try:
+            r = self._get_with_backoff(url, headers, tries)
+            if r is not None and r.status_code == 200:
+                with self._get_lock:
+                    self._get_cache[url] = (time.monotonic() + ttl, r)
+            fut.set_result(r)
+            return r
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._get_lock:
+                self._get_inflight.pop(url, None)
+
+    def _invalidate_get(self, url):
+        with self._get_lock:
+            self._get_cache.pop(url, None)
+
+    def _get_with_backoff(self, url, headers, tries=3):
         for i in range(tries):
             try:
-                r = requests.get(url, headers=headers, timeout=30)
+                r = self._request('get', url, headers=headers, timeout=30)
                 if r.status_code == 200: return r
                 if r.status_code in (429, 500, 502, 503, 504):
-                    time.sleep((2**i) * 2 + random.uniform(0, 1.5)); continue
+                    self._backoff(url, i); continue
                 return r
+            except CircuitOpenError:
+                raise
             except Exception:
                 if i < tries-1:
-                    time.sleep((2**i) * 2 + random.uniform(0, 1.5))
+                    self._backoff(url, i)
                 else:
                     raise
 
     def _post_with_backoff(self, url, headers, json_payload, tries=3):
+        return self._send_with_backoff('post', url, headers, json_payload, tries)
+
+    def _patch_with_backoff(self, url, headers, json_payload, tries=3):
+        return self._send_with_backoff('patch', url, headers, json_payload, tries)
+
+    def _send_with_backoff(self, method, url, headers, json_payload, tries=3):
         for i in range(tries):
             try:
-                r = requests.post(url, headers=headers, json=json_payload, timeout=30)
+                r = self._request(method, url, headers=headers, json=json_payload, timeout=30)
                 if r.status_code in (200, 201, 202): return r
                 if r.status_code in (429, 500, 502, 503, 504):
-                    time.sleep((2**i) * 2 + random.uniform(0, 1.5)); continue
+                    self._backoff(url, i); continue
                 return r
+            except CircuitOpenError:
+                raise
             except Exception:
                 if i < tries-1:
-                    time.sleep((2**i) * 2 + random.uniform(0, 1.5))
+                    self._backoff(url, i)
                 else:
                     raise
 
     # ----- Webflow lookups (v2 uses ?slug=) -----
+    def _slug_lookup_url(self, slug):
+        return f'https://api.webflow.com/v2/collections/{self.collection_id}/items?slug={requests.utils.quote(slug)}'
+
     def slug_exists(self, slug: str) -> bool:
         try:
-            q = requests.utils.quote(slug)
-            r = self._get(
-                f'https://api.webflow.com/v2/collections/{WEBFLOW_COLLECTION_ID}/items?slug={q}',
-                self.webflow_headers
-            )
+            # cached: seeding and the per-post guard ask about the same slugs
+            r = self._get(self._slug_lookup_url(slug), self.webflow_headers, ttl=SLUG_LOOKUP_TTL_SECONDS)
             if r and r.status_code == 200:
                 items = r.json().get('items', [])
                 for it in items:
                     fd = (it.get('fieldData') or {})
                     if fd.get('slug') == slug or it.get('slug') == slug:
                         return True
+        except CircuitOpenError:
+            raise
         except Exception:
             pass
         return False
 
+    def list_collection_items(self, collection_id):
+        """Stream every item in a collection, WEBFLOW_BULK_LIMIT per request."""
+        offset = 0
+        while True:
+            r = self._get(
+                f'https://api.webflow.com/v2/collections/{collection_id}/items?offset={offset}&limit={WEBFLOW_BULK_LIMIT}',
+                self.webflow_headers
+            )
+            if not r or r.status_code != 200:
+                raise RuntimeError(f"list items failed for {collection_id}: {getattr(r, 'status_code', None)}")
+            data = r.json()
+            items = data.get('items', [])
+            yield from items
+            total = (data.get('pagination') or {}).get('total', 0)
+            offset += len(items)
+            if not items or offset >= total:
+                return
+
+    def bulk_upsert_items(self, collection_id, fielddata_list, source_hashes=None, sent_hashes=None):
+        """
+        Create-or-update by slug in a handful of calls: one paginated listing,
+        then bulk create / bulk update in chunks of WEBFLOW_BULK_LIMIT.
+        Items whose fieldData is unchanged are left alone. With source_hashes
+        ({slug: hash of what we generate}), "unchanged" means equal to
+        sent_hashes (what was last sent, updated in place) instead of a
+        comparison with Webflow's normalized copy. Returns (created, updated, unchanged).
+        """
+        existing = {}
+        for it in self.list_collection_items(collection_id):
+            fd = it.get('fieldData') or {}
+            existing[fd.get('slug')] = (it.get('id'), fd)
+        creates, updates, unchanged = [], [], 0
+        for fd in fielddata_list:
+            fd = self._filter_to_allowed(fd, collection_id)
+            current = existing.get(fd['slug'])
+            if source_hashes is not None:
+                stale = source_hashes.get(fd['slug']) != sent_hashes.get(fd['slug'])
+            else:
+                stale = current and any(current[1].get(k) != v for k, v in fd.items())
+            if not current:
+                creates.append({"isArchived": False, "isDraft": False, "fieldData": fd})
+            elif stale:
+                updates.append({"id": current[0], "fieldData": fd})
+            else:
+                unchanged += 1
+        url = f'https://api.webflow.com/v2/collections/{collection_id}/items'
+        created = updated = 0
+        for i in range(0, len(creates), WEBFLOW_BULK_LIMIT):
+            chunk = creates[i:i + WEBFLOW_BULK_LIMIT]
+            r = self._post_with_backoff(url, self.webflow_headers, {"items": chunk})
+            if r and r.status_code in (200, 201, 202):
+                created += len(chunk)
+                self._record_sent(chunk, source_hashes, sent_hashes)
+                ids = [self._response_item_id(r, j) for j in range(len(chunk))]
+                self.queue_publish(collection_id, ids)
+            else:
+                print(f"❌ Bulk create failed: {getattr(r, 'status_code', None)} {getattr(r, 'text', '')}")
+        for i in range(0, len(updates), WEBFLOW_BULK_LIMIT):
+            chunk = updates[i:i + WEBFLOW_BULK_LIMIT]
+            r = self._patch_with_backoff(url, self.webflow_headers, {"items": chunk})
+            if r and r.status_code in (200, 201, 202):
+                updated += len(chunk)
+                self._record_sent(chunk, source_hashes, sent_hashes)
+                self.queue_publish(collection_id, [x['id'] for x in chunk])
+            else:
+                print(f"❌ Bulk update failed: {getattr(r, 'status_code', None)} {getattr(r, 'text', '')}")
+        return created, updated, unchanged
+
+    def _record_sent(self, chunk, source_hashes, sent_hashes):
+        if source_hashes is not None:
+            for item in chunk:
+                slug = item['fieldData']['slug']
+                sent_hashes[slug] = source_hashes.get(slug)
+
     # ----- Local JSON helpers -----
     def _load_set(self, path):
         if os.path.exists(path):
@@ -420,49 +1530,166 @@ class ProductionBlogGenerator:
         last_space = truncated.rfind(' ')
         return text[:last_space] if last_space > max_length * 0.8 else text[:max_length]
 
-    def _is_missing(self, value):
-        return value in (None, "N/A") or (isinstance(value, str) and value.strip() == "")
-
-    def _to_float(self, value):
-        try: return float(str(value).replace(',', ''))
-        except: return None
+    def _fmt_num(self, value, default="N/A"):
+        if value is None: return default
+        return str(int(value)) if float(value).is_integer() else str(round(value, 2))
 
     def _as_webflow_image(self, url, alt=""):
-        FALLBACK = "https://cdn.prod.website-files.com/670bfa1fd9c3c20a149fa6a7/688d2acad067d5e2eb678698_footballblog.png"
-        u = (url or "").strip() or FALLBACK
-        return {"url": u, "alt": alt}
+        u, file_id = self._resolve_headshot(url)
+        image = {"url": u, "alt": alt}
+        if file_id:
+            image["fileId"] = file_id
+        return image
+
+    # ----- Headshot assets -----
+    def _resolve_headshot(self, url):
+        """Map a Supabase headshot URL to (url, webflow_file_id) using the asset cache."""
+        u = (url or "").strip()
+        entry = self.image_assets.get(u) or {}
+        if entry.get("url"):
+            return entry["url"], entry.get("id")
+        if not u or entry.get("invalid"):
+            return DEFAULT_IMAGE_URL, None
+        return u, None  # not checked yet, or validated but upload failed
+
+    def _check_headshot(self, url):
+        """True/False for a definitive answer, None when the check itself failed (retry next run)."""
+        try:
+            r = self._request('head', url, allow_redirects=True, timeout=10)
+            if r.status_code == 405:  # some CDNs refuse HEAD
+                r = self._request('get', url, stream=True, timeout=10)
+                r.close()
+            if r.status_code == 429 or r.status_code >= 500:
+                return None
+            return r.status_code == 200 and r.headers.get('Content-Type', '').startswith('image/')
+        except Exception:
+            return None
 
-    def _webflow_allowed_fields(self):
-        if hasattr(self, "_wf_fields_cache"): return self._wf_fields_cache
+    def _upload_headshot_asset(self, url):
+        img = self._request('get', url, timeout=30)
+        if img.status_code != 200 or not img.content:
+            return None
+        file_name = os.path.basename(urlparse(url).path) or "headshot.png"
+        meta = self._post_with_backoff(
+            f'https://api.webflow.com/v2/sites/{self.site_id}/assets', self.webflow_headers,
+            {"fileName": file_name, "fileHash": hashlib.md5(img.content).hexdigest()}
+        )
+        if not meta or meta.status_code not in (200, 201, 202):
+            return None
+        asset = meta.json()
+        up = self._request(
+            'post', asset['uploadUrl'], data=asset.get('uploadDetails') or {},
+            files={'file': (file_name, img.content, img.headers.get('Content-Type', 'image/png'))}, timeout=60
+        )
+        if up.status_code not in (200, 201, 204):
+            return None
+        hosted = asset.get('hostedUrl') or asset.get('assetUrl')
+        return {"id": asset.get('id'), "url": hosted} if hosted else None
+
+    def _process_headshot(self, url):
+        ok = self._check_headshot(url)
+        asset = None
+        if ok:
+            try:
+                asset = self._upload_headshot_asset(url)
+            except Exception:
+                asset = None
+        return url, ok, asset
+
+    def prepare_headshot_assets(self, players):
+        """
+        Validate every uncached headshot in the batch concurrently and upload the
+        good ones to Webflow assets once. Results persist (url -> asset) so a
+        player's image is never re-checked or re-uploaded on later runs.
+        """
+        urls = {p.player_headshot_url for p in players if p.player_headshot_url}
+        todo = sorted(u for u in urls if u not in self.image_assets)
+        if not todo:
+            return
+        print(f"🖼️ Validating {len(todo)} headshots ({IMAGE_WORKERS} workers)...")
+        with ThreadPoolExecutor(max_workers=max(1, IMAGE_WORKERS)) as pool:
+            results = list(pool.map(self._process_headshot, todo))
+        uploaded = broken = 0
+        for url, ok, asset in results:
+            if ok is False:
+                self.image_assets[url] = {"invalid": True}
+                broken += 1
+            elif asset:
+                self.image_assets[url] = asset
+                uploaded += 1
+        print(f"🖼️ Headshots: {uploaded} uploaded, {broken} broken (fallback image), "
+              f"{len(todo) - uploaded - broken} unresolved")
+        if uploaded or broken:
+            self._save_state_key(self._image_assets_key, self.image_assets_path, self.image_assets, shared=True)
+
+    def _load_image_assets(self):
+        assets = self._load_state_key(self._image_assets_key, self.image_assets_path, {}, shared=True)
+        if not assets and self.target.is_default:
+            # before assets were keyed by site, the env target kept them under 'image_assets'
+            assets = self._load_state_key('image_assets', self.target.path("image_assets.json"), {})
+        return assets
+
+    def _webflow_allowed_fields(self, collection_id=None):
+        collection_id = collection_id or self.collection_id
+        if not hasattr(self, "_wf_fields_cache"): self._wf_fields_cache = {}
+        if collection_id in self._wf_fields_cache: return self._wf_fields_cache[collection_id]
         # Minimal set present in your collection; script will auto-filter to this.
         fallback = {
             "name", "slug", "post-body", "post-summary",
             "main-image", "meta-title", "meta-description", "featured", "url"
         }
         try:
-            r = self._get(f'https://api.webflow.com/v2/collections/{WEBFLOW_COLLECTION_ID}', self.webflow_headers)
-            r.raise_for_status()
-            data = r.json()
-            schema_slugs = {f.get("slug") for f in data.get("fields", []) if f.get("slug")}
+            schema_slugs = set(self._collection_meta(collection_id)["fields"])
             schema_slugs |= {"name", "slug", "main-image"}
             allowed = schema_slugs if schema_slugs else fallback
         except Exception:
             allowed = fallback
-        self._wf_fields_cache = allowed
+        self._wf_fields_cache[collection_id] = allowed
         return allowed
 
-    def _filter_to_allowed(self, fielddata: dict):
-        allowed = self._webflow_allowed_fields()
+    # ----- Persisted Webflow metadata (schema, domains) -----
+    def _meta_entry(self, kind, key):
+        entry = self._wf_meta[kind].get(key)
+        if entry and time.time() - entry.get('fetched_at', 0) < WEBFLOW_META_TTL_SECONDS:
+            return entry
+        return None
+
+    def _store_meta(self, kind, key, entry):
+        entry['fetched_at'] = time.time()
+        with self._wf_meta_lock:
+            # merge with what other targets' generators (or runs) wrote since we loaded it
+            stored = self._load_state_key('webflow_meta', WEBFLOW_META_PATH, {}, shared=True)
+            for k in ('collections', 'domains'):
+                self._wf_meta[k] = {**stored.get(k, {}), **self._wf_meta[k]}
+            self._wf_meta[kind][key] = entry
+            self._save_state_key('webflow_meta', WEBFLOW_META_PATH, self._wf_meta, shared=True)
+        return entry
+
+    def _collection_meta(self, collection_id):
+        """{'fields': [slugs], 'slug': collection slug}; on disk for WEBFLOW_META_TTL_SECONDS."""
+        entry = self._meta_entry('collections', collection_id)
+        if entry:
+            return entry
+        r = self._get(f'https://api.webflow.com/v2/collections/{collection_id}', self.webflow_headers,
+                      ttl=WEBFLOW_META_TTL_SECONDS)
+        r.raise_for_status()
+        data = r.json()
+        return self._store_meta('collections', collection_id, {
+            'fields': sorted(f["slug"] for f in data.get("fields", []) if f.get("slug")),
+            'slug': data.get("slug") or data.get("displaySlug"),
+        })
+
+    def _filter_to_allowed(self, fielddata: dict, collection_id=None):
+        allowed = self._webflow_allowed_fields(collection_id)
         filtered = {k: v for k, v in fielddata.items() if k in allowed}
         return filtered
 
     # ----- Content generation -----
-    def check_data_completeness(self, player_data):
-        required = ["rushing_yards_line", "receiving_yards_line", "rushing_touchdowns_line",
-                    "receiving_touchdowns_line", "fantasy_score"]
-        na = sum(1 for k in required if self._is_missing(player_data.get(k)))
-        score = 5 - na
-        return (na < 3), ("Data complete" if na < 3 else f"Insufficient market data ({na}/5 missing)"), score
+    def check_data_completeness(self, player):
+        na = sum(1 for k in COMPLETENESS_FIELDS if getattr(player, k) is None)
+        score = len(COMPLETENESS_FIELDS) - na
+        ok = score >= MIN_COMPLETE_FIELDS
+        return ok, ("Data complete" if ok else f"Insufficient market data ({na}/{len(COMPLETENESS_FIELDS)} missing)"), score
 
     def guarantee_primary_keyword(self, html_content, variation_index=0):
         PRIMARY = KEYWORD_VARIATIONS[variation_index % len(KEYWORD_VARIATIONS)]
@@ -482,31 +1709,132 @@ class ProductionBlogGenerator:
             return normalized.replace('</p>', '</p>\n' + block, 1)
         return block + "\n" + normalized
 
+    # ----- Internal links -----
+    def live_slugs(self, collection_id=None):
+        """
+        Slugs of the live (not archived, not draft) items in a collection, from
+        one paginated scan per run; None if the scan failed. Ranks move daily,
+        so links go by the slugs that exist, never by posted_ranks.
+        """
+        collection_id = collection_id or self.collection_id
+        if collection_id not in self._live_slugs:
+            try:
+                self._live_slugs[collection_id] = {
+                    (it.get('fieldData') or {}).get('slug') for it in self.list_collection_items(collection_id)
+                    if not it.get('isArchived') and not it.get('isDraft')
+                } - {None}
+            except Exception as e:
+                print(f"⚠️ Could not list live items in {collection_id}: {e}")
+                return None
+        return self._live_slugs[collection_id]
+
+    def build_link_index(self, catalog):
+        """Index every catalog player whose article is live, at today's rank."""
+        self.link_index = LinkIndex()
+        live = self.live_slugs()
+        if live is None:
+            print("🔗 Link index: live slugs unavailable — no related links this run")
+            return
+        for p in catalog:
+            full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(p.name, p.name))
+            if self._slugify_name(full_name) in live:
+                self._index_article(p)
+        print(f"🔗 Link index: {len(self.link_index)} published articles")
+
+    def _index_article(self, player):
+        full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(player.name, player.name))
+        slug = self._slugify_name(full_name)
+        self.link_index.add(player.position, player.team, player.rank, slug, full_name)
+        return slug
+
+    def _least_used(self, bucket, options):
+        counts = self.used_anchors[bucket]
+        return min(range(len(options)), key=lambda i: (counts.get(options[i], 0), i))
+
+    def plan_internal_links(self, post_body, player, slug):
+        """
+        Add the primary-keyword link (least-used KEYWORD_VARIATIONS entry) and a
+        Related Rankings block: nearest-rank articles at the same position plus
+        a teammate, preferring targets with the fewest inbound links so far.
+        Returns (post_body, usage); pass usage to record_link_usage once posted.
+        """
+        kw_index = self._least_used('keywords', KEYWORD_VARIATIONS)
+        post_body = self.guarantee_primary_keyword(post_body, kw_index)
+        usage = {'keywords': [KEYWORD_VARIATIONS[kw_index]], 'templates': [], 'targets': []}
+
+        targets_used = self.used_anchors['targets']
+        exclude = {slug}
+        by_pos = self.link_index.nearest_by_position(player.position, player.rank, RELATED_CANDIDATES, exclude)
+        picks = sorted(by_pos, key=lambda e: (targets_used.get(e[0], 0), abs(e[2] - player.rank)))[:RELATED_LINKS_PER_ARTICLE - 1]
+        exclude |= {e[0] for e in picks}
+        picks += self.link_index.nearest_by_team(player.team, player.rank, 1, exclude)
+        if not picks:
+            return post_body, usage
+
+        items = []
+        template_counts = dict(self.used_anchors['templates'])
+        for target_slug, name, rank, position in picks:
+            t = min(range(len(RELATED_ANCHOR_TEMPLATES)),
+                    key=lambda i: (template_counts.get(RELATED_ANCHOR_TEMPLATES[i], 0), i))
+            template = RELATED_ANCHOR_TEMPLATES[t]
+            template_counts[template] = template_counts.get(template, 0) + 1
+            usage['templates'].append(template)
+            usage['targets'].append(target_slug)
+            items.append(f'<li><a href="/{self.collection_path}/{target_slug}">{template.format(name=name)}</a> '
+                         f'(#{rank} {position or ""})</li>')
+        block = ('<div style="border:1px solid #eee;border-radius:8px;padding:14px;margin:18px 0;">'
+                 '<strong>Related Rankings</strong><ul>' + ''.join(items) + '</ul></div>')
+        marker = '\n<script type="application/ld+json">'
+        if marker in post_body:
+            post_body = post_body.replace(marker, '\n' + block + marker, 1)
+        else:
+            post_body += '\n' + block
+        return post_body, usage
+
+    def record_link_usage(self, usage, player):
+        """Bump anchor/target counters and index the new article for later links."""
+        for bucket, keys in usage.items():
+            counts = self.used_anchors[bucket]
+            for key in keys:
+                counts[key] = counts.get(key, 0) + 1
+        slug = self._index_article(player)
+        if self._live_slugs.get(self.collection_id) is not None:
+            self._live_slugs[self.collection_id].add(slug)
+
     def comparable_delta_enhanced(self, base_player, comp_player):
         deltas = []
         for field, label in [('rushing_touchdowns_line', 'TD line'),
                              ('receiving_yards_line', 'Rec yards'),
                              ('playoff_sos_score', 'Playoff SOS'),
                              ('fantasy_score', 'Proj points')]:
-            bv = self._to_float(base_player.get(field))
-            cv = self._to_float(comp_player.get(field))
+            bv = getattr(base_player, field)
+            cv = getattr(comp_player, field)
             if bv is not None and cv is not None:
                 diff = bv - cv
                 sign = '+' if diff >= 0 else ''
                 deltas.append(f"{label} {sign}{round(diff, 1)}")
         return ', '.join(deltas) if deltas else 'similar profile'
 
-    def generate_article_html(self, full_name, position, player_data, espn_rank, overall_rank, all_players_data):
+    def generate_article_html(self, full_name, position, player, espn_rank, overall_rank, all_players_data,
+                              seed=None, rendered_at=None):
+        # Variant picks are seeded from the render inputs, so same data -> same HTML
+        if seed is None:
+            seed = self._render_seed(full_name, position, player, espn_rank, overall_rank)
+        rng = random.Random(seed)
+        rendered_at = rendered_at or datetime.now(timezone.utc)
+
         # Sections / body
-        rush_line = self._to_float(player_data.get('rushing_yards_line'))
-        rec_line = self._to_float(player_data.get('receiving_yards_line'))
-        td_line = self._to_float(player_data.get('rushing_touchdowns_line')) or self._to_float(player_data.get('receiving_touchdowns_line'))
-        fantasy_score = self._to_float(player_data.get('fantasy_score'))
+        td_line = player.rushing_touchdowns_line or player.receiving_touchdowns_line
+        fantasy_score = player.fantasy_score
+        sos = player.playoff_sos_score
+        sos_value = sos if sos is not None else 50
+        sos_text = self._fmt_num(sos)
+        tier = player.playoff_tier or 'Average'
 
         sections = ['market_intel', 'production', 'championship', 'health', 'strategy']
         if position == 'RB':
             sections = ['championship', 'production', 'market_intel', 'health', 'strategy']
-        elif position == 'WR' and random.random() > 0.6:
+        elif position == 'WR' and rng.random() > 0.6:
             sections = ['production', 'market_intel', 'championship', 'strategy', 'health']
 
         INTRO_STYLES = {
@@ -515,13 +1843,13 @@ class ProductionBlogGenerator:
             "comparison": f"ESPN ranks {full_name} at #{espn_rank or '—'}, but Vegas betting markets tell a different story. Our market-implied projections place {full_name} at #{overall_rank} overall.",
             "insight": "When sportsbooks set player prop lines, they're pricing real performance expectations. That market efficiency creates actionable fantasy insights traditional analysis overlooks."
         }
-        intro_text = INTRO_STYLES[random.choice(list(INTRO_STYLES.keys()))]
+        intro_text = INTRO_STYLES[rng.choice(list(INTRO_STYLES.keys()))]
 
         post_body = (
-            f'<p><em>By Jake Turner • Updated {datetime.now(timezone.utc).strftime("%B %d, %Y at %I:%M %p UTC")}</em></p>\n'
+            f'<p><em>By Jake Turner • Updated {rendered_at.strftime("%B %d, %Y at %I:%M %p UTC")}</em></p>\n'
             f'<p>{intro_text}</p>\n'
             '<h2>Market vs. Media Rankings</h2>\n'
-            f'<p>Our analysis places {full_name} at #{overall_rank} overall and #{player_data.get("position_rank", "N/A")} at {position}, compared to ESPN\'s ranking of #{espn_rank or "—"}.</p>\n'
+            f'<p>Our analysis places {full_name} at #{overall_rank} overall and #{self._fmt_num(player.position_rank)} at {position}, compared to ESPN\'s ranking of #{espn_rank or "—"}.</p>\n'
             f'<p>{"The market prices " + full_name + " higher than ESPN (#" + str(overall_rank) + " vs #" + str(espn_rank) + "), suggesting undervalued consensus opportunity." if espn_rank and overall_rank < espn_rank else "ESPN ranks " + full_name + " at #" + str(espn_rank) + " while market data suggests #" + str(overall_rank) + ", indicating potential overvaluation." if espn_rank and overall_rank > espn_rank else "Both market and ESPN align, but our market-driven analysis reveals deeper context ESPN misses."}</p>\n'
         )
         if espn_rank:
@@ -539,20 +1867,24 @@ class ProductionBlogGenerator:
             if insight:
                 post_body += f'<p><strong>Consensus View:</strong> {insight}</p>\n'
 
+        key_insight = (
+            f"<p><strong>Key Insight:</strong> {full_name}'s {self._fmt_num(td_line)} TD line implies 60%+ red-zone involvement—historically correlated with teams averaging 25+ PPG.</p>"
+            if td_line and td_line > 7 else ''
+        )
         section_content = {
             'market_intel': f'''<h2>Market Intelligence</h2>
 <p>The betting market's precision in pricing player outcomes makes our sportsbook-implied outlook significantly more reliable than conventional analysis.</p>
-{f'<p><strong>Key Insight:</strong> {full_name}\'s {td_line} TD line implies 60%+ red-zone involvement—historically correlated with teams averaging 25+ PPG.</p>' if td_line and td_line > 7 else ''}''',
+{key_insight}''',
 
             'production': f'''<h2>Fantasy Production Outlook</h2>
-<p>Our betting market insights position {full_name} with a projected fantasy score of {fantasy_score or "N/A"} points. This projection accounts for market efficiency patterns that traditional methods miss.</p>''',
+<p>Our betting market insights position {full_name} with a projected fantasy score of {self._fmt_num(fantasy_score)} points. This projection accounts for market efficiency patterns that traditional methods miss.</p>''',
 
             'championship': f'''<h2>Championship Weeks Assessment</h2>
-<p>Playoff SOS score: {player_data.get('playoff_sos_score', 'N/A')} ({player_data.get('playoff_tier', 'Average')} tier)</p>
-<p>Championship-week scheduling makes {full_name} {'advantageous' if player_data.get('playoff_sos_score', 50) > 65 else 'challenging' if player_data.get('playoff_sos_score', 50) < 45 else 'neutral'} for playoff builds during weeks 15-17.</p>''',
+<p>Playoff SOS score: {sos_text} ({tier} tier)</p>
+<p>Championship-week scheduling makes {full_name} {'advantageous' if sos_value > 65 else 'challenging' if sos_value < 45 else 'neutral'} for playoff builds during weeks 15-17.</p>''',
 
             'health': f'''<h2>Health & Availability Profile</h2>
-<p>Projected games missed: {player_data.get('projected_games_missed', 'N/A')}</p>
+<p>Projected games missed: {self._fmt_num(player.projected_games_missed)}</p>
 <p>Market-implied values incorporate injury-adjusted distributions for realistic availability expectations.</p>''',
 
             'strategy': f'''<h2>Market-Based Draft Strategy</h2>
@@ -565,8 +1897,8 @@ class ProductionBlogGenerator:
         # Key takeaways
         takeaways = [
             f"{full_name} market rank: #{overall_rank}",
-            f"Projected fantasy points: {fantasy_score if fantasy_score is not None else 'N/A'}",
-            f"Playoff SOS: {player_data.get('playoff_sos_score','N/A')} ({player_data.get('playoff_tier','Average')} tier)",
+            f"Projected fantasy points: {self._fmt_num(fantasy_score)}",
+            f"Playoff SOS: {sos_text} ({tier} tier)",
             f"TD line insight present: {'Yes' if (td_line and td_line > 7) else 'No'}",
         ]
         post_body += (
@@ -583,18 +1915,18 @@ class ProductionBlogGenerator:
         # FAQs
         def gen_faqs():
             faqs = []
-            primary_q = random.choice(FAQ_POOLS['primary']).format(name=full_name)
-            primary_a = f"Based on Vegas-derived projections, {full_name} provides {'elite' if overall_rank <= 12 else 'strong' if overall_rank <= 24 else 'solid'} value at #{overall_rank} with {player_data.get('fantasy_score', 'N/A')} projected points."
+            primary_q = rng.choice(FAQ_POOLS['primary']).format(name=full_name)
+            primary_a = f"Based on Vegas-derived projections, {full_name} provides {'elite' if overall_rank <= 12 else 'strong' if overall_rank <= 24 else 'solid'} value at #{overall_rank} with {self._fmt_num(fantasy_score)} projected points."
             faqs.append((primary_q, primary_a))
-            secondary_q = random.choice(FAQ_POOLS['secondary'])
-            secondary_a = random.choice([
+            secondary_q = rng.choice(FAQ_POOLS['secondary'])
+            secondary_a = rng.choice([
                 "Sportsbook lines react to injuries, depth charts, and news in real-time, creating actionable edges that static preseason projections miss.",
                 "Market efficiency in pricing player outcomes makes Vegas-derived projections more responsive to changing conditions than expert consensus rankings."
             ])
             faqs.append((secondary_q, secondary_a))
-            if random.random() > 0.5:
-                contextual_q = random.choice(FAQ_POOLS['contextual']).format(name=full_name)
-                contextual_a = f"{'Favorable' if player_data.get('playoff_sos_score', 50) > 65 else 'Challenging' if player_data.get('playoff_sos_score', 50) < 45 else 'Neutral'} playoff matchups with {player_data.get('playoff_sos_score', 'N/A')} SOS score."
+            if rng.random() > 0.5:
+                contextual_q = rng.choice(FAQ_POOLS['contextual']).format(name=full_name)
+                contextual_a = f"{'Favorable' if sos_value > 65 else 'Challenging' if sos_value < 45 else 'Neutral'} playoff matchups with {sos_text} SOS score."
                 faqs.append((contextual_q, contextual_a))
             return faqs
 
@@ -604,10 +1936,10 @@ class ProductionBlogGenerator:
             post_body += f"<h3>{q}</h3>\n<p>{a}</p>\n\n"
 
         # Hub links
-        team = player_data.get('team', 'Unknown')
-        position = player_data.get('position', 'Unknown')
+        team = player.team or 'Unknown'
+        position = player.position or 'Unknown'
         position_lower = position.lower()
-        team_lower = team.lower().replace(' ', '-')
+        team_lower = self._team_slug(team)
         hub_links = f'''<div style="background:#f8f9fa;border:1px solid #e9ecef;border-radius:8px;padding:16px;margin:20px 0;">
 <strong>Explore More:</strong> 
 <a href="/fantasy-football/">All Rankings</a> • 
@@ -622,17 +1954,16 @@ class ProductionBlogGenerator:
             "@type": "SportsArticle",
             "headline": f"{full_name} Fantasy 2025: Market-Based Outlook",
             "about": [{"@type": "Person", "name": full_name}],
-            "datePublished": datetime.now(timezone.utc).isoformat(),
-            "dateModified": datetime.now(timezone.utc).isoformat(),
+            "datePublished": rendered_at.isoformat(),
+            "dateModified": rendered_at.isoformat(),
             "author": {"@type": "Person", "name": "Jake Turner"},
             "publisher": {"@type": "Organization", "name": "The Betting Insider",
                           "logo": {"@type": "ImageObject", "url": "https://thebettinginsider.com/logo.png"}},
-            "image": {"@type": "ImageObject", "url": (player_data.get('player_headshot_url') or
-                    'https://cdn.prod.website-files.com/670bfa1fd9c3c20a149fa6a7/688d2acad067d5e2eb678698_footballblog.png'),
+            "image": {"@type": "ImageObject", "url": self._resolve_headshot(player.player_headshot_url)[0],
                       "width": 400, "height": 400},
             "articleSection": "Fantasy Football",
             "keywords": [f"{full_name} fantasy 2025", f"{position} rankings"],
-            "mainEntityOfPage": {"@type": "WebPage", "@id": f"https://thebettinginsider.com/{COLLECTION_PATH}/{self._slugify_name(full_name)}"}
+            "mainEntityOfPage": {"@type": "WebPage", "@id": f"https://thebettinginsider.com/{self.collection_path}/{self._slugify_name(full_name)}"}
         }
         faq_entities = [{"@type": "Question", "name": q, "acceptedAnswer": {"@type": "Answer", "text": a}} for q, a in faqs]
         faq_schema = {"@context": "https://schema.org", "@type": "FAQPage", "mainEntity": faq_entities}
@@ -641,6 +1972,166 @@ class ProductionBlogGenerator:
 
         return post_body
 
+    # ----- Render cache (content-addressed) -----
+    def _render_fingerprint(self, full_name, position, player, espn_rank, overall_rank):
+        """Stable hash of everything that feeds the article template."""
+        inputs = {
+            "template": RENDER_TEMPLATE_VERSION,
+            "collection_path": self.collection_path,
+            "name": full_name, "position": position,
+            "espn_rank": espn_rank, "overall_rank": overall_rank,
+            "image": self._resolve_headshot(player.player_headshot_url)[0],
+            "data": player.as_dict(),
+        }
+        blob = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(blob.encode()).hexdigest()
+
+    def _render_seed(self, full_name, position, player, espn_rank, overall_rank, fingerprint=None):
+        fingerprint = fingerprint or self._render_fingerprint(full_name, position, player, espn_rank, overall_rank)
+        return f"{player.id or full_name}:{fingerprint}"
+
+    def _content_hash(self, post_body):
+        """Hash of the article text, leaving out the byline date and the JSON-LD (which carries dates)."""
+        body = re.sub(r'<script[^>]*>.*?</script>', '', post_body, flags=re.S)
+        body = re.sub(r'• Updated [^<]*', '', body)
+        clean_content = re.sub(r'<[^>]+>', '', body)
+        return hashlib.sha1(clean_content.encode()).hexdigest()
+
+    def _load_render_cache(self):
+        if self._render_cache is None:
+            self._render_cache = self._load_json(self.render_cache_path, {})
+        return self._render_cache
+
+    def _load_render_stamps(self):
+        """fingerprint -> {'rendered_at', 'content_hash'} of its first render."""
+        if self._render_stamps is None:
+            if self._render_stamps_key:
+                self._render_stamps = self._load_state_key(self._render_stamps_key, self.render_stamps_path, {})
+            else:
+                self._render_stamps = self._load_json(self.render_stamps_path, {})
+        return self._render_stamps
+
+    def _rendered_at(self, key):
+        """The fingerprint's original render time, so a re-render reproduces the same HTML."""
+        stamp = self._load_render_stamps().get(key)
+        try:
+            return datetime.fromisoformat(stamp['rendered_at'])
+        except (TypeError, KeyError, ValueError):
+            return datetime.now(timezone.utc)
+
+    def _remember_render(self, key, post_body, content_hash, rendered_at):
+        self._load_render_cache()[key] = {'html': post_body, 'content_hash': content_hash,
+                                          'rendered_at': rendered_at.isoformat()}
+        self._load_render_stamps()[key] = {'rendered_at': rendered_at.isoformat(), 'content_hash': content_hash}
+        self._render_cache_dirty = True
+
+    @staticmethod
+    def _newest(entries, limit):
+        if len(entries) <= limit:
+            return entries
+        return dict(sorted(entries.items(), key=lambda kv: kv[1].get('rendered_at', ''), reverse=True)[:limit])
+
+    def save_render_cache(self):
+        if not self._render_cache_dirty:
+            return
+        self._render_cache = self._newest(self._load_render_cache(), RENDER_CACHE_MAX)
+        self._render_stamps = self._newest(self._load_render_stamps(), RENDER_CACHE_MAX)
+        self._save_json(self.render_cache_path, self._render_cache)
+        if self._render_stamps_key:
+            self._save_state_key(self._render_stamps_key, self.render_stamps_path, self._render_stamps)
+        else:
+            self._save_json(self.render_stamps_path, self._render_stamps)
+        self._render_cache_dirty = False
+
+    def render_article(self, full_name, position, player, espn_rank, overall_rank, all_players_data):
+        """
+        Render through the on-disk cache keyed by the input fingerprint.
+        Returns (post_body, content_hash, cached). Unchanged inputs return the
+        exact HTML (and hash) from the first render, timestamp included; after
+        a cache loss the persisted render time reproduces it.
+        """
+        key = self._render_fingerprint(full_name, position, player, espn_rank, overall_rank)
+        cache = self._load_render_cache()
+        hit = cache.get(key)
+        if hit:
+            return hit['html'], hit['content_hash'], True
+        rendered_at = self._rendered_at(key)
+        post_body = self.generate_article_html(
+            full_name, position, player, espn_rank, overall_rank, all_players_data,
+            seed=self._render_seed(full_name, position, player, espn_rank, overall_rank, fingerprint=key),
+            rendered_at=rendered_at,
+        )
+        content_hash = self._content_hash(post_body)
+        self._remember_render(key, post_body, content_hash, rendered_at)
+        return post_body, content_hash, False
+
+    def render_articles(self, jobs):
+        """
+        Batch render_article for full re-renders. jobs are (full_name, position,
+        player, espn_rank, overall_rank) tuples; results come back in the same
+        order. With enough cache misses the first chunk is timed and, if the
+        rest would save more than a pool start costs, the rest goes to a
+        process pool; seeds and render times are fixed up front, so the HTML
+        matches a serial render.
+        """
+        cache = self._load_render_cache()
+        keys, todo = [], {}
+        for full_name, position, player, espn_rank, overall_rank in jobs:
+            key = self._render_fingerprint(full_name, position, player, espn_rank, overall_rank)
+            keys.append(key)
+            if key not in cache and key not in todo:
+                seed = self._render_seed(full_name, position, player, espn_rank, overall_rank, fingerprint=key)
+                todo[key] = (key, full_name, position, player.as_tuple(), espn_rank, overall_rank, seed,
+                             self._rendered_at(key))
+        pending = list(todo.values())
+        workers = min(RENDER_WORKERS or os.cpu_count() or 1, -(-len(pending) // RENDER_CHUNK_SIZE) - 1)
+        results = []
+        if len(pending) >= RENDER_POOL_MIN and workers > 1:
+            started = time.perf_counter()
+            results = _render_chunk(pending[:RENDER_CHUNK_SIZE], self)
+            per_render = (time.perf_counter() - started) / RENDER_CHUNK_SIZE
+            pending = pending[RENDER_CHUNK_SIZE:]
+            saving = per_render * len(pending) * (1 - 1 / workers)
+            if saving > RENDER_POOL_STARTUP_SECONDS:
+                chunks = [pending[i:i + RENDER_CHUNK_SIZE] for i in range(0, len(pending), RENDER_CHUNK_SIZE)]
+                print(f"🧵 Rendering {len(pending)} articles on {workers} processes ({len(chunks)} chunks, "
+                      f"{per_render * 1000:.2f}ms each serially)")
+                # forkserver: workers never inherit the parent's threads, locks or open sockets
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                                         initializer=_init_render_worker,
+                                         initargs=(self.collection_path, self.image_assets)) as pool:
+                    results += [r for chunk in pool.map(_render_chunk, chunks) for r in chunk]
+                pending = []
+        results += _render_chunk(pending, self)
+        for key, post_body, content_hash in results:
+            self._remember_render(key, post_body, content_hash, todo[key][-1])
+        return [(cache[k]['html'], cache[k]['content_hash'], k not in todo) for k in keys]
+
+    # ----- Article archive -----
+    def archive_article(self, slug, rank, field_data, content_hash, fingerprint):
+        """Keep a local copy of what went out; never fails the post it records."""
+        try:
+            version = self.archive.append(slug, rank, field_data, fingerprint, content_hash)
+            print(f"🗄️ Archived {slug} (version {version})")
+        except Exception as e:
+            print(f"⚠️ Could not archive {slug}: {e}")
+
+    def show_archived(self, key, version=0, diff=False):
+        """CLI view of the archive: a slug or '#<rank>', newest version unless told otherwise."""
+        by_rank = key.startswith('#') and key[1:].isdigit()
+        record = self.archive.get(rank=int(key[1:]), version=version) if by_rank else self.archive.get(key, version=version)
+        if not record:
+            print(f"❌ Nothing archived for {key} (version {version})"); return None
+        slug = record['slug']
+        print(f"🗄️ {slug} #{record['rank']} • version {self.archive.versions(slug) - version} of "
+              f"{self.archive.versions(slug)} • {record['archived_at']} • hash {record['content_hash']}")
+        if diff:
+            print(self.archive.diff(slug, older=version + 1, newer=version) or "ℹ️ No older version to diff against")
+        else:
+            print(json.dumps(record['fieldData'], indent=2))
+        return record
+
     # ----- Webflow seeding from existing items -----
     def seed_posted_ranks_from_webflow(self, all_players):
         """
@@ -650,54 +2141,334 @@ class ProductionBlogGenerator:
         """
         added = 0
         for p in all_players:
-            name_raw = p.get('name', '')
-            full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(name_raw, name_raw))
+            full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(p.name, p.name))
             base_slug = self._slugify_name(full_name)
+            rank = p.overall_rank or 0
+            if not rank or rank in self.posted_ranks:
+                continue
             try:
-                rank = int(p.get('overall_rank', 0))
-            except:
-                rank = 0
-            if rank and self.slug_exists(base_slug) and rank not in self.posted_ranks:
+                exists = self.slug_exists(base_slug)
+            except CircuitOpenError as e:
+                print(f"🔌 {e} — skipping Webflow seeding, relying on local state")
+                break
+            if exists:
                 self.posted_ranks.add(rank)
                 added += 1
         if added:
             print(f"🧩 Seeded {added} ranks from existing Webflow items")
             self.save_posted_ranks_to_supabase()
 
-    # ----- Main loop -----
-    def run_daily_posting(self, posts_per_day=9):
-        print(f"🚀 Starting DAILY production posting - {posts_per_day} new blogs")
-        print(f"📅 {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        print(f"📁 State persistence: {'Supabase + file fallback' if HAS_SUPABASE else 'file-only'} in {STATE_DIR}")
-        if HAS_SUPABASE:
-            print("✅ Supabase state persistence")
+    # ----- Hub pages -----
+    def group_catalog(self, catalog):
+        """One pass over the rank-ordered catalog -> ({position: [players]}, {team: [players]})."""
+        by_position, by_team = {}, {}
+        for p in sorted(catalog, key=lambda x: x.rank):
+            if p.position:
+                by_position.setdefault(p.position, []).append(p)
+            if p.team:
+                by_team.setdefault(p.team, []).append(p)
+        return by_position, by_team
+
+    def render_hub_html(self, heading, players):
+        """Hub body as headings and lists: Webflow rich text has no tables."""
+        live = self.live_slugs() or set()
+        rows, edges = [], []
+        for p in players:
+            full_name = self._canonical_player(p.name)
+            espn_rank = ESPN_RANKINGS.get(full_name)
+            delta = espn_rank - p.rank if espn_rank else None
+            if delta and delta > 0:
+                edges.append((delta, full_name))
+            delta_text = '—' if delta is None else (f'+{delta}' if delta > 0 else str(delta))
+            name_cell = full_name
+            slug = self._slugify_name(full_name)
+            if slug in live:
+                name_cell = f'<a href="/{self.collection_path}/{slug}">{full_name}</a>'
+            rows.append(
+                f'<li><strong>#{p.rank}</strong> {name_cell} — {p.position or ""}{self._fmt_num(p.position_rank, "")}'
+                f'{", " + p.team if p.team else ""} • ESPN {"#" + str(espn_rank) if espn_rank else "—"} '
+                f'(delta {delta_text}) • {self._fmt_num(p.fantasy_score)} proj pts</li>'
+            )
+        edge_text = ', '.join(f"{name} (+{d})" for d, name in sorted(edges, reverse=True)[:3])
+        return (
+            f'<p>Market-implied {heading} rankings built from sportsbook player props, compared against ESPN. '
+            'A positive delta means the betting market ranks the player higher than ESPN does; '
+            'ranks update as lines move.</p>\n'
+            + (f'<p><strong>Biggest market edges:</strong> {edge_text}</p>\n' if edge_text else '')
+            + f'<h2>{heading} rankings: market rank, ESPN rank, delta, projected points</h2>\n<ol>\n'
+            + '\n'.join(rows) +
+            '\n</ol>\n'
+            '<p><a href="/fantasy-football/">All Rankings</a></p>'
+        )
+
+    def _hub_fielddata(self, slug, title, meta, body, path):
+        return {
+            "name": self.word_safe_clamp(title, 60), "slug": slug, "post-body": body,
+            "post-summary": self.word_safe_clamp(meta, 220),
+            "meta-title": self.word_safe_clamp(title, 60), "meta-description": self.word_safe_clamp(meta, 160),
+            "url": f"https://thebettinginsider.com{path}",
+        }
+
+    def generate_hub_pages(self, catalog):
+        """
+        Render and bulk-upsert every position and team hub from one grouping
+        pass. Returns the number of hub items created or updated.
+        """
+        if not (WEBFLOW_POSITION_HUB_COLLECTION_ID or WEBFLOW_TEAM_HUB_COLLECTION_ID):
+            print("ℹ️ No hub collections configured (WEBFLOW_*_HUB_COLLECTION_ID); skipping hubs")
+            return 0
+        by_position, by_team = self.group_catalog(catalog)
+        targets = []
+        if WEBFLOW_POSITION_HUB_COLLECTION_ID:
+            targets.append((WEBFLOW_POSITION_HUB_COLLECTION_ID, [
+                self._hub_fielddata(
+                    pos.lower(), f"{pos} Fantasy Rankings 2025: Vegas vs ESPN",
+                    f"Market-based {pos} fantasy rankings for 2025 with ESPN rank deltas for {len(players)} players.",
+                    self.render_hub_html(pos, players), f"/fantasy-football/{pos.lower()}/")
+                for pos, players in by_position.items()
+            ]))
+        if WEBFLOW_TEAM_HUB_COLLECTION_ID:
+            targets.append((WEBFLOW_TEAM_HUB_COLLECTION_ID, [
+                self._hub_fielddata(
+                    self._team_slug(team), f"{team} Fantasy Football 2025: Vegas vs ESPN",
+                    f"Every fantasy-relevant {team} player ranked by betting markets, with ESPN deltas.",
+                    self.render_hub_html(team, players), f"/teams/{self._team_slug(team)}/fantasy/")
+                for team, players in by_team.items()
+            ]))
+        # Webflow normalizes rich text, so compare what we generate now with what we last sent
+        hub_hashes = self._load_state_key('hub_hashes', self.target.path("hub_hashes.json"), {})
+        changed = 0
+        for collection_id, items in targets:
+            source = {fd['slug']: hashlib.sha1(json.dumps(fd, sort_keys=True).encode()).hexdigest() for fd in items}
+            sent = hub_hashes.setdefault(collection_id, {})
             try:
-                test = requests.get(f'{SUPABASE_URL}/rest/v1/players?limit=1', headers=self.supabase_headers, timeout=10)
-                print(f"🔍 Supabase test response: {test.status_code}")
-                if test.status_code != 200:
-                    print(f"❌ Supabase connection failed: {test.text}"); return
-                print("✅ Supabase connection successful")
+                created, updated, unchanged = self.bulk_upsert_items(collection_id, items, source, sent)
             except Exception as e:
-                print(f"❌ Supabase connection error: {e}"); return
-        else:
+                print(f"❌ Hub upsert failed for collection {collection_id}: {e}")
+                continue
+            print(f"🗂️ Hubs in {collection_id}: {created} created, {updated} updated, {unchanged} unchanged")
+            changed += created + updated
+        if changed:
+            self._save_state_key('hub_hashes', self.target.path("hub_hashes.json"), hub_hashes)
+        return changed
+
+    def run_hub_generation(self):
+        if not HAS_SUPABASE:
             print("❌ Supabase credentials are required to fetch player data."); return
+        with self.profiler.stage('fetch'):
+            catalog = self.load_catalog()
+        if catalog is None:
+            return
+        with self.profiler.stage('post'):
+            changed = self.generate_hub_pages(catalog)
+        with self.profiler.stage('publish'):
+            self.publish_pending()
+            self.background.drain(BACKGROUND_DRAIN_SECONDS)
+
+    # ----- Collection reconciliation -----
+    def _article_title(self, full_name, rank):
+        return self.word_safe_clamp(f"{full_name} Fantasy Outlook 2025 (Vegas vs ESPN, #{rank})", 60)
+
+    def _article_meta(self, full_name, rank, espn_rank):
+        return self.word_safe_clamp(
+            f"{full_name} market rank #{rank} vs ESPN #{espn_rank or '—'}. Full breakdown, projections.", 160)
+
+    def _item_rank(self, fd):
+        """Rank an item was published with (meta first: the title may be clamped before '#N')."""
+        m = re.search(r'market rank #(\d+)', fd.get('meta-description') or '')
+        m = m or re.search(r'#(\d+)\)', fd.get('name') or '')
+        return int(m.group(1)) if m else None
+
+    def reconcile_collection(self, catalog):
+        """
+        Stream the whole article collection once and diff it in memory against
+        the catalog and posted_ranks. Returns (report, expected) where
+        expected maps base slug -> (full_name, PlayerRecord). Items for players
+        in the players table but outside the catalog window, and items that do
+        not look generated (no market rank, e.g. hand-written posts), are
+        reported apart and never archived.
+        """
+        expected = {}
+        for p in catalog:
+            full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(p.name, p.name))
+            expected[self._slugify_name(full_name)] = (full_name, p)
+        known = self.load_player_slugs()
+        if known is None:
+            print("⚠️ Full player list unavailable — items outside the catalog are not treated as orphans this run")
+
+        live = {}
+        for it in self.list_collection_items(self.collection_id):
+            fd = it.get('fieldData') or {}
+            if not it.get('isArchived') and fd.get('slug'):
+                live[fd['slug']] = (it.get('id'), fd)
+
+        duplicates, orphans, outside, unmanaged, stale, live_ranks, covered = [], [], [], [], [], set(), set()
+        for slug, (item_id, fd) in live.items():
+            m = re.match(r'^(.+)-(\d+)$', slug)
+            # only a duplicate while its base is live: otherwise it is the player's only live copy
+            if m and m.group(1) in live:
+                duplicates.append({'id': item_id, 'slug': slug, 'base': m.group(1)})
+                continue
+            if slug not in expected and (not m or m.group(1) not in expected):
+                entry = {'id': item_id, 'slug': slug, 'name': fd.get('name')}
+                if self._item_rank(fd) is None:
+                    unmanaged.append(entry)
+                elif known is not None and slug not in known and not (m and m.group(1) in known):
+                    orphans.append(entry)
+                else:
+                    outside.append(entry)
+                continue
+            base = slug if slug in expected else m.group(1)  # a -N copy stands in for an archived/missing base
+            covered.add(base)
+            full_name, p = expected[base]
+            live_ranks.add(p.rank)
+            published_rank = self._item_rank(fd)
+            if published_rank is not None and published_rank != p.rank:
+                stale.append({'id': item_id, 'slug': slug, 'base': base,
+                              'published_rank': published_rank, 'current_rank': p.rank})
+
+        catalog_ranks = {p.rank for p in catalog}
+        report = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'collection_id': self.collection_id,
+            'live_items': len(live),
+            'catalog_players': len(catalog),
+            'duplicates': duplicates,
+            'orphans': orphans,
+            'outside_catalog_window': outside,
+            'not_generated': unmanaged,
+            'stale_ranks': stale,
+            'ranks_missing_from_state': sorted(live_ranks - self.posted_ranks),
+            'state_ranks_without_item': sorted((self.posted_ranks & catalog_ranks) - live_ranks),
+            'unposted_players': sum(1 for slug in expected if slug not in covered),
+        }
+        self._save_json(self.reconcile_report_path, report)
+        print(f"🧾 Reconcile: {len(live)} live items, {len(duplicates)} duplicates, {len(orphans)} orphans, "
+              f"{len(outside)} outside catalog window (kept), {len(unmanaged)} not generated (kept), "
+              f"{len(stale)} stale ranks, {len(report['ranks_missing_from_state'])} ranks missing from state, "
+              f"{len(report['state_ranks_without_item'])} state ranks without an item → {self.reconcile_report_path}")
+        return report, expected
+
+    def apply_reconciliation(self, report, expected, catalog):
+        """Bulk-archive duplicates/orphans, bulk-fix stale ranks, resync posted_ranks. Returns items changed."""
+        url = f'https://api.webflow.com/v2/collections/{self.collection_id}/items'
+        archive = [{"id": x['id'], "isArchived": True} for x in report['duplicates'] + report['orphans']]
+        fixes = []
+        rerender = [expected[x['base']] for x in report['stale_ranks']]
+        rerender = [(n, p) for n, p in rerender if catalog.has_market_data and self.check_data_completeness(p)[0]]
+        with self.profiler.stage('render'):
+            bodies = self.render_articles([(n, p.position or 'Unknown', p, ESPN_RANKINGS.get(n), p.rank)
+                                           for n, p in rerender])
+        bodies = {n: body for (n, _), (body, _, _) in zip(rerender, bodies)}
+        for x in report['stale_ranks']:
+            full_name, p = expected[x['base']]
+            espn_rank = ESPN_RANKINGS.get(full_name)
+            fd = {"name": self._article_title(full_name, p.rank), "meta-title": self._article_title(full_name, p.rank),
+                  "meta-description": self._article_meta(full_name, p.rank, espn_rank)}
+            if full_name in bodies:
+                body = bodies[full_name]
+                fd["post-body"] = body
+                fd["post-summary"] = self.word_safe_clamp(re.sub(r'<[^>]+>', '', body).strip(), 220)
+            fixes.append({"id": x['id'], "fieldData": self._filter_to_allowed(fd)})
+        changed = 0
+        for label, batch in (("archived", archive), ("fixed", fixes)):
+            for i in range(0, len(batch), WEBFLOW_BULK_LIMIT):
+                chunk = batch[i:i + WEBFLOW_BULK_LIMIT]
+                r = self._patch_with_backoff(url, self.webflow_headers, {"items": chunk})
+                if r and r.status_code in (200, 201, 202):
+                    changed += len(chunk)
+                    print(f"🧹 {label} {len(chunk)} items")
+                    if label == "archived":
+                        self.queue_publish(site_wide=True)  # archived items only drop off the live site on a site publish
+                    else:
+                        self.queue_publish(self.collection_id, [x['id'] for x in chunk])
+                else:
+                    print(f"❌ Bulk {label} failed: {getattr(r, 'status_code', None)} {getattr(r, 'text', '')}")
+        self.save_render_cache()
+        missing, orphaned = report['ranks_missing_from_state'], report['state_ranks_without_item']
+        if missing or orphaned:
+            # Dropped ranks become postable again; the base-slug guard still blocks true duplicates.
+            self.posted_ranks = (self.posted_ranks | set(missing)) - set(orphaned)
+            self.save_posted_ranks_to_supabase()
+            print(f"🏷️ posted_ranks resynced: +{len(missing)} / -{len(orphaned)}")
+        return changed
 
-        print("📊 Fetching all players...")
+    def run_reconciliation(self, apply=False):
+        if not HAS_SUPABASE:
+            print("❌ Supabase credentials are required to fetch player data."); return
+        with self.profiler.stage('fetch'):
+            catalog = self.load_catalog()
+        if catalog is None:
+            return
         try:
-            r = requests.get(
-                f'{SUPABASE_URL}/rest/v1/players?position=not.in.(D/ST,K)&order=overall_rank.asc&limit=175',
-                headers=self.supabase_headers, timeout=30
-            )
-            print(f"📊 Player fetch response: {r.status_code}")
-            if r.status_code != 200:
-                print(f"❌ Failed to fetch players: {r.status_code}"); print(f"❌ Response text: {r.text}"); return
-            all_players = r.json()
-            print(f"📊 Found {len(all_players)} total players")
+            with self.profiler.stage('fetch'):
+                report, expected = self.reconcile_collection(catalog)
+        except Exception as e:
+            print(f"❌ Reconcile scan failed: {e}"); return
+        if not apply:
+            print("ℹ️ Dry run — re-run with --apply to archive/fix items and resync state")
+            return
+        with self.profiler.stage('post'):
+            changed = self.apply_reconciliation(report, expected, catalog)
+        with self.profiler.stage('publish'):
+            self.publish_pending()
+            self.background.drain(BACKGROUND_DRAIN_SECONDS)
+
+    # ----- Main loop -----
+    def check_supabase(self):
+        print(f"📁 State persistence: {'Supabase + file fallback' if HAS_SUPABASE else 'file-only'} in {self.state_dir}")
+        if not HAS_SUPABASE:
+            print("❌ Supabase credentials are required to fetch player data."); return False
+        print("✅ Supabase state persistence")
+        try:
+            test = self._request('get', f'{SUPABASE_URL}/rest/v1/players?limit=1', headers=self.supabase_headers, timeout=10)
+            print(f"🔍 Supabase test response: {test.status_code}")
+            if test.status_code != 200:
+                print(f"❌ Supabase connection failed: {test.text}"); return False
+            print("✅ Supabase connection successful")
+            return True
         except Exception as e:
-            print(f"❌ Error fetching players: {e}"); return
+            print(f"❌ Supabase connection error: {e}"); return False
+
+    def run_daily_posting(self, posts_per_day=9):
+        print(f"🚀 Starting DAILY production posting - {posts_per_day} new blogs")
+        print(f"📅 {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        if not self.check_supabase():
+            return
+
+        with self.profiler.stage('fetch'):
+            all_players = self.load_catalog()
+        if all_players is None:
+            return
+
+        plan = self.prepare_daily_run(all_players, posts_per_day)
+        if plan is None:
+            # nothing new, but changes deferred by an earlier run may be due now
+            with self.profiler.stage('publish'):
+                self.publish_pending()
+                self.background.drain(BACKGROUND_DRAIN_SECONDS)
+            return
+        # Publish needs the custom domain ids; fetch them while we post
+        self._domains_future = self.background.submit('custom domains', self._fetch_custom_domain_ids)
+        while self.post_next(plan):
+            pass
+        self.finish_daily_run(plan)
+
+    def prepare_daily_run(self, all_players, posts_per_day):
+        """
+        Seed, exclude and pick the candidates for this target out of an already
+        loaded catalog. Returns the plan post_next() works through, or None if
+        there is nothing left to post.
+        """
+        if self.target.positions:
+            all_players = PlayerCatalog([p for p in all_players if p.position in self.target.positions],
+                                        has_market_data=all_players.has_market_data)
+            print(f"🎯 {self.target.name}: {len(all_players)} players at {', '.join(sorted(self.target.positions))}")
 
         # 🔧 NEW: Bootstrap posted_ranks from Webflow every run
-        self.seed_posted_ranks_from_webflow(all_players)
+        with self.profiler.stage('seeding'):
+            self.seed_posted_ranks_from_webflow(all_players)
+            self.build_link_index(all_players)
 
         # Build exclusion set
         exclude = set(self.posted_ranks)
@@ -706,161 +2477,327 @@ class ProductionBlogGenerator:
         if EXCLUDE_RANKS_EXTRA:
             exclude |= EXCLUDE_RANKS_EXTRA
 
-        def _safe_rank(p):
-            try: return int(p.get('overall_rank', 999))
-            except: return 999
-
-        unposted = [p for p in all_players if _safe_rank(p) not in exclude]
-        unposted = sorted(unposted, key=lambda x: _safe_rank(x))
+        unposted = [p for p in all_players if p.rank not in exclude]
+        unposted = sorted(unposted, key=lambda x: x.rank)
+        incomplete_ranks = []
+        if all_players.has_market_data:
+            # Score completeness catalog-wide up front so sparse rows never take a batch slot
+            complete = {id(p) for p in all_players.complete_records()}
+            incomplete_ranks = [p.rank for p in unposted if id(p) not in complete]
+            unposted = [p for p in unposted if id(p) in complete]
+            print(f"📊 Pre-scored completeness: {len(incomplete_ranks)} unposted players lack market data")
 
         print(f"📊 Excluding {len(exclude)} ranks; sample: {sorted(list(exclude))[:20]}")
-        print(f"📊 Next up ranks: {[ _safe_rank(p) for p in unposted[:10] ]}")
+        print(f"📊 Next up ranks: {[p.rank for p in unposted[:10]]}")
 
-        daily_batch = unposted[:posts_per_day]
+        daily_batch = unposted[:posts_per_day]  # skips below are backfilled from the rest of `unposted`
         print(f"📝 Today's batch: {len(daily_batch)} new players")
         print(f"🏷️ Already posted by rank: {len(self.posted_ranks)}")
-        print(f"🔄 Remaining after today: {len(unposted) - len(daily_batch)}")
 
         if not daily_batch:
             print("🎉 All available players have been posted (given current exclusions)!")
-            return
+            return None
 
-        successful = 0
-        failed = 0
-        data_skipped = 0
+        with self.profiler.stage('fetch'):
+            self.prepare_headshot_assets(daily_batch)  # backfill candidates are validated as they come up
 
-        for i, player in enumerate(daily_batch):
-            name_raw = player['name']
-            try:
-                player_rank = int(player.get('overall_rank', 999))
-            except:
-                player_rank = 999
+        return {
+            'catalog': all_players, 'posts_per_day': posts_per_day, 'unposted': unposted,
+            'candidates': enumerate(unposted), 'done': False,
+            'successful': 0, 'failed': 0, 'data_skipped': 0, 'aborted': None,
+            'incomplete_ranks': incomplete_ranks, 'reached': None,  # last candidate rank taken (inf: ran out)
+        }
 
-            full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(name_raw, name_raw))
-            base_slug = self._slugify_name(full_name)
+    def _abort_plan(self, plan, host):
+        plan['aborted'], plan['done'] = host, True
+        return False
 
-            print(f"\n📝 Processing {i+1}/{len(daily_batch)}: #{player_rank} {name_raw}")
+    def post_next(self, plan):
+        """
+        Work one candidate of the plan (post, skip or fail it). Returns False
+        once the plan is finished, so callers can interleave several targets.
+        """
+        if plan['done'] or plan['successful'] + plan['failed'] >= plan['posts_per_day']:
+            plan['done'] = True
+            return False
+        i, player = next(plan['candidates'], (None, None))
+        if player is None:
+            plan['done'], plan['reached'] = True, math.inf
+            return False
+        plan['reached'] = player.rank
+        down = self._upstream_down()
+        if down:
+            print(f"🔌 Upstream down ({', '.join(down)}) — aborting posting cleanly; state saved so far is kept")
+            return self._abort_plan(plan, ', '.join(down))
+        all_players = plan['catalog']
+        name_raw = player.name
+        player_rank = player.rank
+
+        full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(name_raw, name_raw))
+        base_slug = self._slugify_name(full_name)
 
-            # ⛔ HARD BASE-SLUG GUARD: if base slug already exists in Webflow, treat as posted and skip
-            if self.slug_exists(base_slug):
-                print(f"⛔ Already exists in Webflow (base slug): {base_slug} — marking rank as posted and skipping")
+        print(f"\n📝 Processing {plan['successful'] + plan['failed'] + 1}/{plan['posts_per_day']} (candidate {i+1}): #{player_rank} {name_raw}")
+
+        # ⛔ HARD BASE-SLUG GUARD: if base slug already exists in Webflow, treat as posted and skip
+        try:
+            with self.profiler.stage('fetch'):
+                already_live = self.slug_exists(base_slug)
+        except CircuitOpenError as e:
+            print(f"🔌 {e} — aborting posting cleanly")
+            return self._abort_plan(plan, e.host)
+        if already_live:
+            print(f"⛔ Already exists in Webflow (base slug): {base_slug} — marking rank as posted and skipping")
+            with self.profiler.stage('state save'):
                 self.posted_ranks.add(player_rank)
                 self.save_posted_ranks_to_supabase()
                 if full_name not in self.posted_players:
-                    self._append_list(POSTED_PATH, full_name)
-                continue
+                    self._append_list(self.posted_path, full_name)
+            return True
 
-            # Fetch detailed data
-            detailed = self.fetch_detailed_player_data(name_raw)
+        # Detailed data: already merged in by the bulk load, else fetch per player
+        if all_players.has_market_data:
+            player_data = player
+            espn_rank = ESPN_RANKINGS.get(full_name)
+        else:
+            with self.profiler.stage('fetch'):
+                detailed = self.fetch_detailed_player_data(name_raw)
             if not detailed:
                 print(f"❌ Fetch failed for {name_raw}")
-                failed += 1
-                continue
-
+                plan['failed'] += 1
+                return True
             player_data = detailed['player']
             espn_rank = detailed.get('espn', {}).get('rank') if detailed.get('espn') else None
-            overall_rank = player_data.get('overall_rank', player_rank)
-            position = player_data.get('position', 'Unknown')
-
-            # Data completeness
-            ok, _, _ = self.check_data_completeness(player_data)
-            if not ok:
-                print(f"⚠️ Data completeness issue: Skipping #{player_rank} {name_raw}")
-                data_skipped += 1
-                continue
-
-            # Build body
-            post_body = self.generate_article_html(full_name, position, player_data, espn_rank, overall_rank, all_players)
-
-            # Title/meta
-            clean_content = re.sub(r'<[^>]+>', '', post_body)
-            content_hash = hashlib.sha1(clean_content.encode()).hexdigest()
-            if content_hash in self.content_hashes:
-                print(f"⚠️ Duplicate content hash for {full_name} — skipping")
-                self.content_hashes.add(content_hash); self.save_content_hashes_to_supabase()
-                self.posted_ranks.add(player_rank); self.save_posted_ranks_to_supabase()
-                continue
-
-            self.content_hashes.add(content_hash); self.save_content_hashes_to_supabase()
-
-            title = self.word_safe_clamp(f"{full_name} Fantasy Outlook 2025 (Vegas vs ESPN, #{overall_rank})", 60)
-            meta = self.word_safe_clamp(
-                f"{full_name} market rank #{overall_rank} vs ESPN #{espn_rank or '—'}. Full breakdown, projections.",
-                160
-            )
-
-            # Images
-            featured_image = (player_data.get('player_headshot_url') or
-                              'https://cdn.prod.website-files.com/670bfa1fd9c3c20a149fa6a7/688d2acad067d5e2eb678698_footballblog.png')
-
-            # Field data (filtered later)
-            fieldData_raw = {
-                "name": title,
-                "slug": base_slug,  # 👈 use base slug ONLY; never "-2" dupes
-                "post-body": post_body,
-                "post-summary": self.word_safe_clamp(clean_content.strip(), 220),
-                "main-image": self._as_webflow_image(featured_image, alt=f"{full_name} fantasy article image"),
-                "meta-title": title,
-                "meta-description": meta,
-                "featured": False,
-                "url": f"https://thebettinginsider.com/{COLLECTION_PATH}/{base_slug}",
-            }
+        overall_rank = player_data.overall_rank or player_rank
+        position = player_data.position or 'Unknown'
+
+        # Data completeness
+        ok, _, _ = self.check_data_completeness(player_data)
+        if not ok:
+            print(f"⚠️ Data completeness issue: Skipping #{player_rank} {name_raw}")
+            plan['data_skipped'] += 1
+            return True
+
+        # Backfill beyond the pre-validated batch: check/upload its headshot now (no-op when cached)
+        with self.profiler.stage('fetch'):
+            self.prepare_headshot_assets([player_data])
+
+        # Build body (render cache: unchanged inputs -> identical HTML and hash)
+        with self.profiler.stage('render'):
+            post_body, content_hash, cached = self.render_article(full_name, position, player_data, espn_rank, overall_rank, all_players)
+        if cached:
+            print(f"♻️ Render cache hit for {full_name}")
+
+        if content_hash in self.content_hashes:
+            print(f"⚠️ Duplicate content hash for {full_name} — already sent, skipping")
+            self.posted_ranks.add(player_rank); self.save_posted_ranks_to_supabase()
+            return True
+
+        # Internal links (outside the render cache: they depend on what is published)
+        with self.profiler.stage('render'):
+            post_body, link_usage = self.plan_internal_links(post_body, player_data, base_slug)
+
+        # Title/meta
+        clean_content = re.sub(r'<[^>]+>', '', post_body)
+
+        title = self._article_title(full_name, overall_rank)
+        meta = self._article_meta(full_name, overall_rank, espn_rank)
+
+        # Images (resolved through the headshot asset cache)
+        featured_image = player_data.player_headshot_url
+
+        # Field data (filtered later)
+        fieldData_raw = {
+            "name": title,
+            "slug": base_slug,  # 👈 use base slug ONLY; never "-2" dupes
+            "post-body": post_body,
+            "post-summary": self.word_safe_clamp(clean_content.strip(), 220),
+            "main-image": self._as_webflow_image(featured_image, alt=f"{full_name} fantasy article image"),
+            "meta-title": title,
+            "meta-description": meta,
+            "featured": False,
+            "url": f"https://thebettinginsider.com/{self.collection_path}/{base_slug}",
+        }
 
-            filtered_data = self._filter_to_allowed(fieldData_raw)
+        filtered_data = self._filter_to_allowed(fieldData_raw)
 
-            print("DEBUG fieldData keys (post-filter):", sorted(filtered_data.keys()), flush=True)
-            print("DEBUG main-image (post-filter):", filtered_data.get("main-image"), flush=True)
+        print("DEBUG fieldData keys (post-filter):", sorted(filtered_data.keys()), flush=True)
+        print("DEBUG main-image (post-filter):", filtered_data.get("main-image"), flush=True)
 
-            # Post to Webflow
-            post_data = {"isArchived": False, "isDraft": False, "fieldData": filtered_data}
-            try:
+        # Post to Webflow
+        post_data = {"isArchived": False, "isDraft": False, "fieldData": filtered_data}
+        try:
+            with self.profiler.stage('post'):
                 response = self._post_with_backoff(
-                    f'https://api.webflow.com/v2/collections/{WEBFLOW_COLLECTION_ID}/items',
+                    f'https://api.webflow.com/v2/collections/{self.collection_id}/items',
                     self.webflow_headers, post_data, tries=3
                 )
-                if response.status_code in (200, 201, 202):
-                    print(f"✅ Posted {full_name} to Webflow (Status: {response.status_code}) - {len(clean_content.split())} words")
-                    # publish url hint
-                    try:
-                        coll_response = self._get(f"https://api.webflow.com/v2/collections/{WEBFLOW_COLLECTION_ID}", self.webflow_headers)
-                        if coll_response and coll_response.status_code == 200:
-                            coll = coll_response.json()
-                            coll_slug = coll.get("slug") or coll.get("displaySlug") or "fantasy-football-updates"
-                            print(f"🔗 New: https://thebettinginsider.com/{coll_slug}/{filtered_data['slug']}")
-                    except Exception:
-                        pass
-
-                    # mark posted
+            if response.status_code in (200, 201, 202):
+                print(f"✅ Posted {full_name} to Webflow (Status: {response.status_code}) - {len(clean_content.split())} words")
+                self._invalidate_get(self._slug_lookup_url(base_slug))
+                self._print_new_url(base_slug)  # schema is already cached by _filter_to_allowed
+                self.queue_publish(self.collection_id, [self._response_item_id(response)],
+                                   [f"https://thebettinginsider.com/{self.collection_path}/{base_slug}"])
+
+                # mark posted (hash only counts once the content actually went out)
+                with self.profiler.stage('state save'):
+                    self.content_hashes.add(content_hash); self.save_content_hashes_to_supabase()
                     self.posted_ranks.add(player_rank); self.save_posted_ranks_to_supabase()
                     self.save_posted_player_to_supabase(full_name, base_slug, content_hash)
+                    self.record_link_usage(link_usage, player_data)
                     self.save_used_anchors_to_supabase()
-                    successful += 1
+                    self.archive_article(base_slug, player_rank, filtered_data, content_hash,
+                                         self._render_fingerprint(full_name, position, player_data, espn_rank, overall_rank))
+                plan['successful'] += 1
+            else:
+                print(f"❌ Failed to post {full_name}: {response.status_code} {response.text}")
+                plan['failed'] += 1
+        except CircuitOpenError as e:
+            print(f"🔌 {e} — aborting posting cleanly")
+            plan['failed'] += 1
+            return self._abort_plan(plan, e.host)
+        except Exception as e:
+            print(f"❌ Error posting {full_name}: {e}")
+            plan['failed'] += 1
+        return True
+
+    def finish_daily_run(self, plan, publish=True):
+        """Save caches, publish (unless the caller publishes per site) and print the summary."""
+        with self.profiler.stage('state save'):
+            self.save_render_cache()
+
+        if publish:
+            with self.profiler.stage('publish'):
+                self.publish_pending()
+
+        label = "" if self.target.is_default else f" [{self.target.name}]"
+        print(f"\n📊 DAILY posting summary{label}:")
+        print(f"✅ Successful: {plan['successful']}")
+        print(f"❌ Failed: {plan['failed']}")
+        # pre-scored players only count as skipped when the batch actually reached past them
+        reached = plan['reached'] if plan['reached'] is not None else -math.inf
+        passed_over = sum(1 for r in plan['incomplete_ranks'] if r < reached)
+        print(f"⚠️ Data issues skipped: {plan['data_skipped'] + passed_over}")
+        if plan['incomplete_ranks']:
+            print(f"📊 Unposted players lacking market data (catalog-wide): {len(plan['incomplete_ranks'])}")
+        if plan['aborted']:
+            print(f"🔌 Aborted early: circuit open for {plan['aborted']}")
+        print(f"📝 Total posted ranks to date: {len(self.posted_ranks)}")
+        remaining = sum(1 for p in plan['unposted'] if p.rank not in self.posted_ranks)
+        print(f"🔄 Remaining after today: {remaining}")
+        if publish:
+            print("\n🎯 Features: base-slug guard • Webflow seeding • true rank dedupe • SEO • file fallbacks")
+            with self.profiler.stage('publish'):
+                self.background.drain(BACKGROUND_DRAIN_SECONDS)
+
+    # ----- Offline render (--render-offline) -----
+    def render_offline(self, out_dir=None):
+        """
+        Render every complete player in the catalog to local HTML files without
+        touching Webflow. Uses its own render cache in out_dir, so test renders
+        are never served to a production run.
+        """
+        out_dir = out_dir or os.path.join(self.state_dir, "rendered")
+        if not HAS_SUPABASE:
+            print("❌ Supabase credentials are required to fetch player data."); return 0
+        self._render_cache, self._render_stamps, self._render_cache_dirty = None, None, False
+        self._render_stamps_key = None
+        self.render_cache_path = os.path.join(out_dir, "render_cache.json")
+        self.render_stamps_path = os.path.join(out_dir, "render_stamps.json")
+        with self.profiler.stage('fetch'):
+            catalog = self.load_catalog()
+        if catalog is None:
+            return 0
+        players = catalog.complete_records() if catalog.has_market_data else list(catalog)
+        os.makedirs(out_dir, exist_ok=True)
+        names = [self._canonical_player(PLAYER_NAME_MAPPING.get(p.name, p.name)) for p in players]
+        with self.profiler.stage('render'):
+            results = self.render_articles([(full_name, p.position or 'Unknown', p, ESPN_RANKINGS.get(full_name), p.rank)
+                                            for full_name, p in zip(names, players)])
+        rendered = hits = 0
+        for full_name, (post_body, _, cached) in zip(names, results):
+            with self.profiler.stage('state save'):
+                with open(os.path.join(out_dir, f"{self._slugify_name(full_name)}.html"), 'w') as f:
+                    f.write(post_body)
+            rendered += 1
+            hits += cached
+        with self.profiler.stage('state save'):
+            self.save_render_cache()
+        print(f"🧪 Rendered {rendered} articles to {out_dir} ({hits} from render cache)")
+        return rendered
+
+    # ----- Data fetch -----
+    def load_player_slugs(self, page=1000):
+        """Base slugs for every player in the table (names only, no window); None on failure."""
+        slugs, offset = set(), 0
+        try:
+            while True:
+                r = self._request(
+                    'get', f'{SUPABASE_URL}/rest/v1/players?select=name&order=id.asc&limit={page}&offset={offset}',
+                    headers=self.supabase_headers, timeout=30
+                )
+                if r.status_code != 200:
+                    print(f"⚠️ Full player list fetch failed: {r.status_code}"); return None
+                rows = r.json()
+                for row in rows:
+                    if row.get('name'):
+                        name = self._canonical_player(PLAYER_NAME_MAPPING.get(row['name'], row['name']))
+                        slugs.add(self._slugify_name(name))
+                if len(rows) < page:
+                    return slugs
+                offset += page
+        except Exception as e:
+            print(f"⚠️ Full player list fetch error: {e}"); return None
+
+    def load_catalog(self, limit=None):
+        """
+        Bulk-load the player list and, in one more request, every betting
+        breakdown for it. Returns a PlayerCatalog (has_market_data=False if the
+        breakdown call failed; callers then fall back to per-player fetches),
+        or None if the players themselves could not be loaded.
+        """
+        limit = limit or CATALOG_LIMIT
+        print("📊 Fetching all players...")
+        try:
+            r = self._request(
+                'get', f'{SUPABASE_URL}/rest/v1/players?position=not.in.(D/ST,K)&order=overall_rank.asc&limit={limit}',
+                headers=self.supabase_headers, timeout=30
+            )
+            print(f"📊 Player fetch response: {r.status_code}")
+            if r.status_code != 200:
+                print(f"❌ Failed to fetch players: {r.status_code}"); print(f"❌ Response text: {r.text}"); return None
+            rows = r.json()
+        except Exception as e:
+            print(f"❌ Error fetching players: {e}"); return None
+
+        has_market_data = False
+        ids = [str(row['id']) for row in rows if row.get('id') is not None]
+        if ids:
+            try:
+                br = self._request(
+                    'get', f'{SUPABASE_URL}/rest/v1/player_betting_breakdown?player_id=in.({",".join(ids)})',
+                    headers=self.supabase_headers, timeout=30
+                )
+                if br.status_code == 200:
+                    betting = {}
+                    for b in br.json():
+                        betting.setdefault(b.get('player_id'), b)  # first row wins, like the per-player fetch
+                    rows = [{**row, **betting.get(row.get('id'), {}), 'id': row.get('id')} for row in rows]
+                    has_market_data = True
+                    print(f"📊 Merged betting breakdown for {len(betting)} players")
                 else:
-                    print(f"❌ Failed to post {full_name}: {response.status_code} {response.text}")
-                    failed += 1
+                    print(f"⚠️ Bulk betting fetch failed ({br.status_code}); falling back to per-player fetches")
             except Exception as e:
-                print(f"❌ Error posting {full_name}: {e}")
-                failed += 1
-
-        if successful > 0:
-            print(f"\n🚀 Publishing Webflow site...")
-            self.publish_webflow_site()
+                print(f"⚠️ Bulk betting fetch error: {e}; falling back to per-player fetches")
 
-        print(f"\n📊 DAILY posting summary:")
-        print(f"✅ Successful: {successful}")
-        print(f"❌ Failed: {failed}")
-        print(f"⚠️ Data issues skipped: {data_skipped}")
-        print(f"📝 Total posted ranks to date: {len(self.posted_ranks)}")
-        est_remaining = max(0, len(all_players) - len(self.posted_ranks) - len(EXCLUDE_RANKS_EXTRA) - EXCLUDE_TOP_N)
-        print(f"🔄 Remaining (est): {est_remaining}")
-        print("\n🎯 Features: base-slug guard • Webflow seeding • true rank dedupe • SEO • file fallbacks")
+        catalog = PlayerCatalog.from_rows(rows, has_market_data=has_market_data)
+        print(f"📊 Found {len(catalog)} total players")
+        return catalog
 
-    # ----- Data fetch -----
     def fetch_detailed_player_data(self, player_name):
         try:
             qname = requests.utils.quote(player_name)
-            player_resp = requests.get(
-                f'{SUPABASE_URL}/rest/v1/players?name=ilike.%25{qname}%25',
+            player_resp = self._request(
+                'get', f'{SUPABASE_URL}/rest/v1/players?name=ilike.%25{qname}%25',
                 headers=self.supabase_headers, timeout=30
             )
             if player_resp.status_code != 200 or not player_resp.json():
@@ -868,12 +2805,12 @@ class ProductionBlogGenerator:
             player_info = player_resp.json()[0]
             player_id = player_info['id']
 
-            betting_resp = requests.get(
-                f'{SUPABASE_URL}/rest/v1/player_betting_breakdown?player_id=eq.{player_id}',
+            betting_resp = self._request(
+                'get', f'{SUPABASE_URL}/rest/v1/player_betting_breakdown?player_id=eq.{player_id}',
                 headers=self.supabase_headers, timeout=30
             )
             betting = betting_resp.json()[0] if betting_resp.status_code == 200 and betting_resp.json() else {}
-            combined = {**player_info, **betting}
+            combined = PlayerRecord.from_row({**player_info, **betting, 'id': player_id})  # the breakdown row has its own id
 
             full_name = self._canonical_player(PLAYER_NAME_MAPPING.get(player_name, player_name))
             espn_rank = ESPN_RANKINGS.get(full_name)
@@ -884,30 +2821,142 @@ class ProductionBlogGenerator:
             return None
 
     # ----- Publishing -----
+    def _fetch_custom_domain_ids(self):
+        """Custom domain ids for the site (disk-cached), or None if they could not be fetched."""
+        entry = self._meta_entry('domains', self.site_id)
+        if entry:
+            return entry['ids']
+        r = self._get(f'https://api.webflow.com/v2/sites/{self.site_id}/custom_domains', self.webflow_headers,
+                      ttl=WEBFLOW_META_TTL_SECONDS)
+        if r and r.status_code == 200:
+            ids = [d["id"] for d in r.json().get("customDomains", []) if d.get("id")]
+            return self._store_meta('domains', self.site_id, {'ids': ids})['ids']
+        return None
+
+    def _print_new_url(self, slug):
+        try:
+            coll_slug = self._collection_meta(self.collection_id).get("slug")
+        except Exception:
+            coll_slug = None
+        print(f"🔗 New: https://thebettinginsider.com/{coll_slug or self.collection_path}/{slug}")
+
+    def _ping_sitemap(self, ping):
+        self._request('get', ping, timeout=10)
+        print(f"📍 Pinged {ping.split('.')[1].title()}")
+
+    def _warm_url(self, url):
+        try:
+            r = self._request('get', url, timeout=15)
+            print(f"🔥 Warmed {url} ({r.status_code})")
+        except Exception as e:
+            print(f"⚠️ Warm-up failed for {url}: {e}")
+
+    def _warm_urls(self, urls, delay=0):
+        """One background task per publish: wait once for the CDN, then warm every URL concurrently."""
+        if delay:
+            time.sleep(delay)  # give the publish a moment to reach the CDN
+        with ThreadPoolExecutor(max_workers=max(1, min(len(urls), BACKGROUND_WORKERS))) as pool:
+            list(pool.map(self._warm_url, urls))
+
+    def _response_item_id(self, response, index=0):
+        """Item id from a single-create ({id}) or bulk-create ({items: [...]}) response, or None."""
+        try:
+            data = response.json() or {}
+            items = data.get('items')
+            return items[index].get('id') if items else data.get('id')
+        except Exception:
+            return None
+
+    def queue_publish(self, collection_id=None, item_ids=(), urls=(), site_wide=False):
+        """Record changes that need publishing. Items without a known id force a site publish."""
+        if site_wide or any(i is None for i in item_ids):
+            self.publisher.mark_site_dirty()
+        if collection_id:
+            self.publisher.add_items(collection_id, [i for i in item_ids if i], urls)
+        self.save_publish_state()
+
+    def save_publish_state(self):
+        self._save_state_key(self._publish_key, self.publish_state_path, self.publisher.as_state(), shared=True)
+
+    def _publish_items(self, pending):
+        for collection_id, ids in pending.items():
+            for i in range(0, len(ids), WEBFLOW_BULK_LIMIT):
+                chunk = ids[i:i + WEBFLOW_BULK_LIMIT]
+                r = self._post_with_backoff(f'https://api.webflow.com/v2/collections/{collection_id}/items/publish',
+                                            self.webflow_headers, {"itemIds": chunk})
+                if not r or r.status_code not in (200, 202):
+                    print(f"❌ Item publish failed in {collection_id}: {getattr(r, 'status_code', None)} "
+                          f"{getattr(r, 'text', '')}")
+                    return False
+            print(f"✅ Published {len(ids)} items in {collection_id}")
+        return True
+
+    def publish_pending(self, force=False):
+        """
+        Publish whatever changed on this site since the last publish: nothing if
+        nothing changed, nothing *yet* if the last publish was under
+        PUBLISH_MIN_INTERVAL_SECONDS ago (the queue persists for a later run),
+        item-level when that covers it, else (or if that fails) the full site.
+        """
+        coord = self.publisher
+        mode = coord.plan(force or self.force_publish)
+        if mode == 'idle':
+            print("ℹ️ No unpublished Webflow changes — skipping publish")
+            return True
+        if mode == 'defer':
+            ago = time.time() - coord.last_publish
+            wait = coord.min_interval - ago
+            if wait < BACKGROUND_DRAIN_SECONDS:
+                # the interval ends inside this run's drain budget: publish then instead of next run
+                print(f"⏳ {coord.item_count} item(s) waiting; last publish {ago:.0f}s ago — publishing in {wait:.0f}s")
+                self.background.submit('delayed publish', self._publish_after, wait)
+                return False
+            print(f"⚠️ NOT PUBLISHED: {coord.item_count} item(s) stay unpublished until a later run — last publish "
+                  f"{ago:.0f}s ago (< {coord.min_interval:.0f}s, next allowed in {wait:.0f}s); "
+                  f"use --force-publish to publish now")
+            return False
+        ok = False
+        if mode == 'items':
+            print(f"\n🚀 Publishing {coord.item_count} changed items...")
+            ok = self._publish_items(coord.pending)
+            if not ok:
+                print("↩️ Falling back to a full site publish")
+        if not ok:
+            print(f"\n🚀 Publishing Webflow site...")
+            ok = self.publish_webflow_site()
+        if ok:
+            urls = coord.urls
+            coord.published()
+            self.save_publish_state()
+            for ping in SITEMAP_PINGS:
+                self.background.submit('sitemap ping', self._ping_sitemap, ping)
+            if urls:
+                self.background.submit('warm-up', self._warm_urls, urls, WARMUP_DELAY_SECONDS)
+        return ok
+
+    def _publish_after(self, delay):
+        time.sleep(max(0.0, delay))
+        return self.publish_pending()
+
     def publish_webflow_site(self, publish_custom=True, publish_staging=True):
         try:
             domain_ids = []
             if publish_custom:
-                r = self._get(f'https://api.webflow.com/v2/sites/{WEBFLOW_SITE_ID}/custom_domains', self.webflow_headers)
-                if r and r.status_code == 200:
-                    data = r.json()
-                    domain_ids = [d["id"] for d in data.get("customDomains", []) if d.get("id")]
-                else:
-                    publish_custom = False
+                try:
+                    fut, self._domains_future = self._domains_future, None
+                    domain_ids = fut.result(timeout=30) if fut else self._fetch_custom_domain_ids()
+                except Exception:
+                    domain_ids = None
+                if domain_ids is None:
+                    domain_ids, publish_custom = [], False
             payload = {"publishToWebflowSubdomain": bool(publish_staging)}
             if publish_custom and domain_ids:
                 payload["customDomains"] = domain_ids
             print("DEBUG publish payload:", payload, flush=True)
-            resp = self._post_with_backoff(f'https://api.webflow.com/v2/sites/{WEBFLOW_SITE_ID}/publish',
+            resp = self._post_with_backoff(f'https://api.webflow.com/v2/sites/{self.site_id}/publish',
                                            self.webflow_headers, payload, tries=3)
             if resp and resp.status_code in (200, 202):
                 print("✅ Webflow site publish queued")
-                for ping in [
-                    "https://www.google.com/ping?sitemap=https://thebettinginsider.com/sitemap.xml",
-                    "https://www.bing.com/ping?sitemap=https://thebettinginsider.com/sitemap.xml",
-                ]:
-                    try: requests.get(ping, timeout=10); print(f"📍 Pinged {ping.split('.')[1].title()}")
-                    except: pass
                 return True
             print(f"❌ Failed to publish site: {getattr(resp, 'status_code', None)} {getattr(resp, 'text', '')}")
             return False
@@ -916,6 +2965,92 @@ class ProductionBlogGenerator:
             return False
 
 
+# ---------- Render workers ----------
+_RENDERER = None  # per worker process, set by _init_render_worker
+
+
+def _init_render_worker(collection_path, image_assets):
+    global _RENDERER
+    _RENDERER = ProductionBlogGenerator.renderer(collection_path, image_assets)
+
+
+def _render_chunk(jobs, renderer=None):
+    """(key, full_name, position, record tuple, espn_rank, overall_rank, seed, rendered_at) -> (key, html, hash)."""
+    renderer = renderer or _RENDERER
+    out = []
+    for key, full_name, position, values, espn_rank, overall_rank, seed, rendered_at in jobs:
+        post_body = renderer.generate_article_html(
+            full_name, position, PlayerRecord.from_tuple(values), espn_rank, overall_rank, None,
+            seed=seed, rendered_at=rendered_at,
+        )
+        out.append((key, post_body, renderer._content_hash(post_body)))
+    return out
+
+
+# ---------- Multi-target runner ----------
+def run_targets(targets, posts_per_day=9, profiler=None, force_publish=False):
+    """
+    Post into several collections from one process: one catalog load, one HTTP
+    pool and background queue, round-robin posting that skips sites whose rate
+    budget is spent, and one publish per site once all of its targets are done.
+    """
+    print(f"🚀 Starting DAILY multi-target posting - {len(targets)} targets")
+    print(f"📅 {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    generators = [ProductionBlogGenerator(t) for t in targets]
+    lead = generators[0]
+    for g in generators:
+        g.background = lead.background
+        g.profiler = profiler or lead.profiler
+        g.force_publish = force_publish
+    if not lead.check_supabase():
+        return
+
+    with lead.profiler.stage('fetch'):
+        catalog = lead.load_catalog()
+    if catalog is None:
+        return
+
+    runs = []
+    for g in generators:
+        print(f"\n🎯 Target {g.target.name}: collection {g.collection_id} on site {g.site_id}")
+        plan = g.prepare_daily_run(catalog, g.target.posts or posts_per_day)
+        if plan is not None:
+            runs.append((g, plan))
+
+    # every site gets its publish pass, even with nothing to post: earlier runs may have deferred changes
+    sites = {}
+    for g in generators:
+        sites.setdefault(g.site_id, []).append(g)
+    for site_id in {g.site_id for g, _ in runs}:
+        publisher = sites[site_id][0]
+        publisher._domains_future = publisher.background.submit('custom domains', publisher._fetch_custom_domain_ids)
+
+    active = list(runs)
+    while active:
+        progressed = False
+        for g, plan in list(active):
+            if g.rate_limiter and g.rate_limiter.wait_time() > 0:
+                continue  # site budget spent; give the other sites a turn
+            progressed = True
+            if not g.post_next(plan):
+                active.remove((g, plan))
+        if active and not progressed:
+            time.sleep(min(g.rate_limiter.wait_time() for g, _ in active))
+
+    for g, plan in runs:
+        g.finish_daily_run(plan, publish=False)
+    for site_id, members in sites.items():
+        # the site's targets share one PublishCoordinator, so this covers all of their items
+        publisher = members[0]
+        print(f"\n🌐 Site {site_id} ({len(members)} targets)")
+        with publisher.profiler.stage('publish'):
+            publisher.publish_pending()
+
+    print("\n🎯 Features: base-slug guard • Webflow seeding • true rank dedupe • SEO • file fallbacks")
+    with lead.profiler.stage('publish'):
+        lead.background.drain(BACKGROUND_DRAIN_SECONDS)
+
+
 # ---------- CLI ----------
 if __name__ == "__main__":
     import argparse
@@ -924,6 +3059,23 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='DAILY production blog posting to Webflow (no-duplicate base slug, Webflow seeding)')
     parser.add_argument('--posts', type=int, default=9, help='Posts per day (default: 9)')
     parser.add_argument('--test', action='store_true', help='Test mode')
+    parser.add_argument('--render-offline', action='store_true',
+                        help='Render every complete player to STATE_DIR/rendered (reads Supabase, never writes Webflow)')
+    parser.add_argument('--hubs', action='store_true', help='Regenerate position/team hub pages instead of posting')
+    parser.add_argument('--reconcile', action='store_true',
+                        help='Scan the whole collection for duplicates/orphans/stale ranks and write a report')
+    parser.add_argument('--apply', action='store_true', help='With --reconcile: archive/fix items and resync state')
+    parser.add_argument('--config', help='JSON file of targets (collections/sites) to post into from one process')
+    parser.add_argument('--force-publish', action='store_true',
+                        help='Publish queued changes now even if the last publish was under PUBLISH_MIN_INTERVAL_SECONDS ago')
+    parser.add_argument('--archived', metavar='SLUG_OR_#RANK',
+                        help='Print an archived article (fieldData) from the local archive instead of posting')
+    parser.add_argument('--archive-version', type=int, default=0, help='With --archived: versions back from the newest')
+    parser.add_argument('--diff', action='store_true', help='With --archived: diff post-body against the previous version')
+    parser.add_argument('--profile', action='store_true',
+                        help='Run under cProfile + tracemalloc; print per-stage timings and write pstats/collapsed stacks')
+    parser.add_argument('--profile-out', default=os.path.join(STATE_DIR, 'profile'),
+                        help='Output prefix for --profile files (default: STATE_DIR/profile)')
     args = parser.parse_args()
     print(f"🔍 DEBUG: Args parsed: posts={args.posts}, test={args.test}")
 
@@ -936,14 +3088,54 @@ if __name__ == "__main__":
 
     print("🔍 DEBUG: Creating generator instance...")
     try:
-        generator = ProductionBlogGenerator()
-        print("✅ Generator instance created successfully")
+        if args.config:
+            targets, generator = load_targets(args.config), None
+            print(f"✅ Loaded {len(targets)} targets from {args.config}")
+        else:
+            generator = ProductionBlogGenerator()
+            generator.force_publish = args.force_publish
+            print("✅ Generator instance created successfully")
     except Exception as e:
         print(f"❌ Failed to create generator: {e}")
         sys.exit(1)
-
-    if args.test:
-        print("🧪 Test mode - no network posting")
+    profiler = StageProfiler(enabled=args.profile)
+
+    def _run():
+        if args.config:
+            print("🔍 DEBUG: Starting multi-target posting...")
+            run_targets(targets, args.posts, profiler, force_publish=args.force_publish)
+        elif args.archived:
+            generator.show_archived(args.archived, version=args.archive_version, diff=args.diff)
+        elif args.test:
+            print("🧪 Test mode - no network posting")
+        elif args.render_offline:
+            print("🧪 Offline render - no Webflow calls")
+            generator.render_offline()
+        elif args.hubs:
+            print("🔍 DEBUG: Regenerating hub pages...")
+            generator.run_hub_generation()
+        elif args.reconcile:
+            print(f"🔍 DEBUG: Reconciling collection ({'apply' if args.apply else 'dry run'})...")
+            generator.run_reconciliation(apply=args.apply)
+        else:
+            print("🔍 DEBUG: Starting daily posting...")
+            generator.run_daily_posting(args.posts)
+
+    if args.profile:
+        import cProfile
+        import pstats
+
+        print(f"⏱️ Profiling enabled -> {args.profile_out}.*")
+        if generator:
+            generator.profiler = profiler
+        profile = cProfile.Profile()
+        profiler.start()
+        profile.enable()
+        try:
+            _run()
+        finally:
+            profile.disable()
+            profiler.stop()
+            profiler.report(args.profile_out, pstats.Stats(profile))
     else:
-        print("🔍 DEBUG: Starting daily posting...")
-        generator.run_daily_posting(args.posts)
+        _run()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# targets_regression_test.py - run_targets with one target must post exactly what run_daily_posting posts
+#
+# Both runs go against the same in-memory Supabase/Webflow fake (no network, no credentials) and
+# the Webflow writes they make are compared after masking timestamps and generated ids.
+#   python targets_regression_test.py
+
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+STATE_ROOT = tempfile.mkdtemp(prefix="targets-regression-")
+os.environ.update(
+    SUPABASE_URL="https://supabase.test", SUPABASE_ANON_KEY="anon",
+    WEBFLOW_API_TOKEN="token", WEBFLOW_SITE_ID="site", WEBFLOW_COLLECTION_ID="coll",
+    STATE_DIR=STATE_ROOT, BACKGROUND_DRAIN_SECONDS="2", WARMUP_DELAY_SECONDS="0",
+)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import production_ready_generator_ship_ready as gen  # noqa: E402
+
+POSITIONS = ['RB', 'WR', 'QB', 'TE']
+TEAMS = ['KC', 'DAL', 'BUF', 'SF']
+PLAYERS = [{
+    'id': i, 'name': f'Test Player {i}', 'position': POSITIONS[i % 4], 'team': TEAMS[i % 4],
+    'overall_rank': i, 'position_rank': i // 4 + 1, 'player_headshot_url': f'https://img.test/{i}.png',
+} for i in range(1, 31)]
+BETTING = [{
+    'id': 1000 + i, 'player_id': i, 'rushing_yards_line': 400 + 7 * i, 'receiving_yards_line': 900 - 11 * i,
+    'rushing_touchdowns_line': 3 + i % 5, 'receiving_touchdowns_line': 2 + i % 4,
+    'fantasy_score': 260 - 3 * i, 'playoff_sos_score': 30 + i,
+} for i in range(1, 31) if i % 6]
+
+VOLATILE = [
+    (re.compile(r'\d{4}-\d{2}-\d{2}T[\d:.]+(?:\+00:00|Z)?'), '<ts>'),
+    (re.compile(r'[A-Z][a-z]+ \d{1,2}, \d{4}( at \d{1,2}:\d{2} [AP]M UTC)?'), '<date>'),
+    (re.compile(r'\bitem-\d+\b'), '<id>'),
+]
+
+
+class Response:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = {} if data is None else data
+        self.text = json.dumps(self._data)
+        self.headers = {'Content-Type': 'image/png'}
+        self.content = b'png'
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeBackend:
+    """Supabase (players, betting, state_data) and the Webflow endpoints a daily run touches."""
+    def __init__(self):
+        self.items, self.state, self.writes = [], {}, []
+
+    def get(self, url, **kwargs):
+        if '/rest/v1/players' in url:
+            return Response(200, PLAYERS[:1] if 'limit=1' in url and 'order=' not in url else PLAYERS)
+        if '/rest/v1/player_betting_breakdown' in url:
+            return Response(200, BETTING)
+        if '/rest/v1/state_data' in url:
+            key = url.split('key=eq.')[-1]
+            return Response(200, [{'data': self.state[key]}] if key in self.state else [])
+        if '/rest/v1/' in url:
+            return Response(200, [])
+        if '/items?slug=' in url:
+            slug = url.split('slug=')[1]
+            return Response(200, {'items': [it for it in self.items if it['fieldData']['slug'] == slug]})
+        if '/items' in url:
+            offset = int(re.search(r'offset=(\d+)', url).group(1)) if 'offset=' in url else 0
+            return Response(200, {'items': self.items[offset:offset + 100],
+                                  'pagination': {'total': len(self.items), 'offset': offset, 'limit': 100}})
+        if url.endswith('/custom_domains'):
+            return Response(200, {'customDomains': [{'id': 'domain'}]})
+        if '/v2/collections/' in url:
+            fields = ['post-body', 'post-summary', 'meta-title', 'meta-description', 'main-image', 'featured', 'url']
+            return Response(200, {'slug': 'fantasy-football-updates', 'fields': [{'slug': f} for f in fields]})
+        return Response(200, {})
+
+    def post(self, url, json=None, **kwargs):
+        if '/rest/v1/state_data' in url:
+            self.state[json['key']] = json['data']
+            return Response(201, {})
+        if '/rest/v1/' in url:
+            return Response(201, {})
+        if 'api.webflow.com' in url:
+            self.writes.append(('POST', url, json))
+        if url.endswith('/items'):
+            item = {'id': f'item-{len(self.items)}', 'fieldData': json['fieldData'], 'isArchived': False}
+            self.items.append(item)
+            return Response(202, {'id': item['id']})
+        if url.endswith('/assets'):
+            return Response(200, {'uploadUrl': 'https://upload.test', 'uploadDetails': {}, 'id': 'asset',
+                                  'hostedUrl': 'https://cdn.test/headshot.png'})
+        return Response(200, {})
+
+    def head(self, url, **kwargs):
+        return Response(200)
+
+    def patch(self, url, json=None, **kwargs):
+        self.writes.append(('PATCH', url, json))
+        return Response(200, {})
+
+
+def masked(writes):
+    out = json.dumps(writes, sort_keys=True, indent=1)
+    for pattern, repl in VOLATILE:
+        out = pattern.sub(repl, out)
+    return out.splitlines()
+
+
+def run(label, driver, posts):
+    state_dir = os.path.join(STATE_ROOT, label)
+    os.makedirs(state_dir)
+    gen.STATE_DIR = state_dir
+    gen.WEBFLOW_META_PATH = os.path.join(state_dir, "webflow_meta.json")
+    gen._PUBLISHERS.clear()
+    gen._IMAGE_ASSETS.clear()
+    backend = FakeBackend()
+    log = StringIO()
+    with mock.patch.multiple(gen.HTTP, get=backend.get, post=backend.post, head=backend.head, patch=backend.patch), \
+            mock.patch.object(gen.time, 'sleep'), redirect_stdout(log):
+        driver(posts)
+    return backend.writes, log.getvalue()
+
+
+def main():
+    posts = 5
+    old, _ = run("run_daily_posting", lambda n: gen.ProductionBlogGenerator().run_daily_posting(n), posts)
+    new, _ = run("run_targets", lambda n: gen.run_targets([gen.Target.from_env()], n), posts)
+
+    created = [w for w in old if w[0] == 'POST' and w[1].endswith('/items')]
+    publishes = [w for w in new if '/publish' in w[1]]
+    print(f"🔍 run_daily_posting: {len(old)} Webflow writes ({len(created)} items created)")
+    print(f"🔍 run_targets:       {len(new)} Webflow writes ({len(publishes)} publish call(s))")
+
+    failures = []
+    if len(created) != posts:
+        failures.append(f"expected {posts} items created, got {len(created)}")
+    if len(publishes) != 1:
+        failures.append(f"expected exactly one publish call from run_targets, got {len(publishes)}")
+    diff = list(gen.difflib.unified_diff(masked(old), masked(new), 'run_daily_posting', 'run_targets', lineterm=''))
+    if diff:
+        failures.append("Webflow writes differ:\n" + '\n'.join(diff[:80]))
+
+    shutil.rmtree(STATE_ROOT, ignore_errors=True)
+    if failures:
+        for f in failures:
+            print(f"❌ {f}")
+        return 1
+    print("✅ Single-target run_targets matches run_daily_posting")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())